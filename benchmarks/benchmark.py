@@ -0,0 +1,84 @@
+from argparse import ArgumentParser
+from configparser import ConfigParser
+from json import dump
+from os import chdir, getcwd
+from os.path import abspath, dirname, join
+from shutil import copyfile
+from sys import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from fake_server import FakeAccount, FakeServer
+
+_ROOT = dirname(dirname(abspath(__file__)))
+path.insert(0, join(_ROOT, 'src'))
+
+from mangadex_follows_exporter import export  # noqa: E402
+from metrics import Metrics  # noqa: E402
+
+
+def _write_configuration(directory: str, mangadex: FakeServer, mangaupdates: FakeServer, workers: int, http2: bool) -> None:
+    config = ConfigParser(interpolation=None)
+    config['mangadex'] = {
+        'username': 'benchmark',
+        'password': 'benchmark',
+        'client_id': 'benchmark',
+        'client_secret': 'benchmark',
+        'workers': str(workers),
+        'api_url': f'{mangadex.url}/mangadex',
+        'authentication_url': f'{mangadex.url}/auth/token'
+    }
+    config['mangaupdates'] = {
+        'username': 'benchmark',
+        'password': 'benchmark',
+        'api_url': f'{mangaupdates.url}/mangaupdates'
+    }
+    config['network'] = {
+        'http2': 'yes' if http2 else 'no'
+    }
+    with open(join(directory, 'configuration.ini'), 'wt', encoding='utf-8') as file:
+        config.write(file)
+
+
+def _main() -> None:
+    parser = ArgumentParser(description='Times a full export against a local stand-in of the MangaDex and MangaUpdates APIs.')
+    parser.add_argument('--follows', type=int, default=1000, help='number of followed titles, e.g. 100 to 50000')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every response')
+    parser.add_argument('--mangadex-rate-limit', type=float, default=5.0, help='MangaDex requests per second, 0 to disable')
+    parser.add_argument('--mangaupdates-rate-limit', type=float, default=1.0, help='MangaUpdates requests per second, 0 to disable')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--workers', type=int, default=1, help='concurrent MangaDex requests')
+    parser.add_argument('--http2', action='store_true', help='use the HTTP/2 transport')
+    parser.add_argument('--exporters', default='CSV,Excel,MangaUpdates', help='comma-separated exporter names')
+    parser.add_argument('--output', default='', help='JSON file to write the results to')
+    arguments = parser.parse_args()
+    account = FakeAccount(arguments.follows)
+    mangadex = FakeServer(account, arguments.latency, arguments.mangadex_rate_limit, arguments.error_rate).start()
+    mangaupdates = FakeServer(account, arguments.latency, arguments.mangaupdates_rate_limit, arguments.error_rate).start()
+    cwd = getcwd()
+    with TemporaryDirectory() as directory:
+        _write_configuration(directory, mangadex, mangaupdates, arguments.workers, arguments.http2)
+        copyfile(join(_ROOT, 'mangaupdates.json'), join(directory, 'mangaupdates.json'))
+        chdir(directory)
+        try:
+            start = perf_counter()
+            export(False, arguments.exporters.split(','))
+            duration = perf_counter() - start
+        finally:
+            chdir(cwd)
+    mangadex.shutdown()
+    mangaupdates.shutdown()
+    print(f'Exported {arguments.follows} follows in {duration:.2f} seconds ({mangadex.requests} MangaDex requests, {mangaupdates.requests} MangaUpdates requests).')
+    if arguments.output != '':
+        results = {
+            'arguments': vars(arguments),
+            'duration': duration,
+            'server_requests': {'mangadex': mangadex.requests, 'mangaupdates': mangaupdates.requests},
+            'metrics': Metrics.get_report()
+        }
+        with open(arguments.output, 'wt', encoding='utf-8') as file:
+            dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    _main()
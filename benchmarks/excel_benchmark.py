@@ -0,0 +1,63 @@
+from argparse import ArgumentParser
+from configparser import ConfigParser
+from json import dump
+from os import chdir, getcwd
+from os.path import abspath, dirname, join
+from sys import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, reset_peak, start, stop
+
+from fake_server import FakeAccount
+
+path.insert(0, join(dirname(dirname(abspath(__file__))), 'src'))
+
+from common import Entry, Status  # noqa: E402
+from excel_exporter import ExcelFileExporter  # noqa: E402
+from mangadex_client import MangaDexClient  # noqa: E402
+
+
+def _export(config: ConfigParser, entries: list[Entry]) -> None:
+    exporter = ExcelFileExporter()
+    exporter.open(config, 'benchmark', len(entries))
+    for entry in entries:
+        exporter.write(entry)
+    exporter.close()
+
+
+def _main() -> None:
+    parser = ArgumentParser(description='Measures the time and the peak memory of the Excel exporter.')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='comma-separated numbers of rows to export')
+    parser.add_argument('--hyperlinks', action='store_true', help='write the URL column as hyperlinks')
+    parser.add_argument('--output', default='', help='JSON file to write the results to')
+    arguments = parser.parse_args()
+    config = ConfigParser(interpolation=None)
+    config['excel'] = {'hyperlinks': 'yes' if arguments.hyperlinks else 'no'}
+    results = {}
+    cwd = getcwd()
+    with TemporaryDirectory() as directory:
+        chdir(directory)
+        try:
+            for size in (int(value) for value in arguments.sizes.split(',')):
+                account = FakeAccount(size)
+                entries = [Entry(MangaDexClient._get_manga(account.mangas[manga_id], Status(manga_id, status)), account.ratings[manga_id], account.personal_ratings.get(manga_id), status) for manga_id, status in account.statuses.items()]
+                time_before = perf_counter()
+                _export(config, entries)
+                duration = perf_counter() - time_before
+                start()
+                reset_peak()
+                memory_before = get_traced_memory()[0]
+                _export(config, entries)
+                peak_memory = get_traced_memory()[1] - memory_before
+                stop()
+                results[size] = {'duration': duration, 'peak_memory': peak_memory}
+                print(f'Exported {size} rows in {duration:.2f} seconds using {peak_memory / 2 ** 20:.1f} MiB at peak.')
+        finally:
+            chdir(cwd)
+    if arguments.output != '':
+        with open(arguments.output, 'wt', encoding='utf-8') as file:
+            dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    _main()
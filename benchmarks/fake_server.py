@@ -0,0 +1,228 @@
+from argparse import ArgumentParser
+from gzip import compress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from random import Random
+from threading import Lock, Thread
+from time import monotonic, sleep, time
+from typing import Any, Self
+from urllib.parse import parse_qs, urlsplit
+from uuid import UUID
+
+
+class FakeAccount:
+
+    follows: list[str]
+    mangas: dict[str, Any]
+    personal_ratings: dict[str, int]
+    ratings: dict[str, float]
+    series_ids: set[int]
+    statuses: dict[str, str]
+    tracked_ids: set[int]
+
+    def __init__(self: Self, follows: int, seed: int = 0) -> None:
+        random = Random(seed)
+        statuses = ('reading', 'on_hold', 'plan_to_read', 'dropped', 're_reading', 'completed')
+        self.follows = [str(UUID(int=random.getrandbits(128), version=4)) for _ in range(follows)]
+        self.mangas = {}
+        self.personal_ratings = {}
+        self.ratings = {}
+        self.series_ids = set()
+        self.statuses = {}
+        self.tracked_ids = set()
+        for index, manga_id in enumerate(self.follows):
+            series_id = 10 * 36 ** 6 + index
+            links = {'mu': self._to_base36(series_id)} if random.random() < 0.9 else None
+            self.mangas[manga_id] = {
+                'id': manga_id,
+                'type': 'manga',
+                'attributes': {
+                    'title': {'en': f'Synthetic Title {index}'},
+                    'altTitles': [{'en': f'Alternative Title {index}'}, {'ja': f'タイトル {index}'}, {'ja-ro': f'Taitoru {index}'}],
+                    'links': links,
+                    'updatedAt': '2020-01-01T00:00:00+00:00'
+                }
+            }
+            self.ratings[manga_id] = round(random.uniform(1, 10), 4)
+            if random.random() < 0.5:
+                self.personal_ratings[manga_id] = random.randint(1, 10)
+            self.statuses[manga_id] = random.choice(statuses)
+            if links is not None and random.random() < 0.98:
+                self.series_ids.add(series_id)
+                if random.random() < 0.3:
+                    self.tracked_ids.add(series_id)
+
+    @staticmethod
+    def _to_base36(value: int) -> str:
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+        result = ''
+        while value > 0:
+            value, remainder = divmod(value, 36)
+            result = digits[remainder] + result
+        return result
+
+
+class FakeServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    account: FakeAccount
+    error_rate: float
+    latency: float
+    rate_limit: float
+    requests: int
+    _lock: Lock
+    _random: Random
+    _tokens: float
+    _updated_at: float
+
+    def __init__(self: Self, account: FakeAccount, latency: float = 0.0, rate_limit: float = 0.0, error_rate: float = 0.0, port: int = 0) -> None:
+        super().__init__(('127.0.0.1', port), _FakeRequestHandler)
+        self.account = account
+        self.error_rate = error_rate
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.requests = 0
+        self._lock = Lock()
+        self._random = Random(1)
+        self._tokens = rate_limit
+        self._updated_at = monotonic()
+
+    @property
+    def url(self: Self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def admit(self: Self) -> tuple[int, dict[str, str]]:
+        with self._lock:
+            self.requests += 1
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                return 503, {}
+            if self.rate_limit <= 0:
+                return 200, {}
+            now = monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated_at) * self.rate_limit)
+            self._updated_at = now
+            headers = {
+                'X-RateLimit-Limit': str(int(self.rate_limit)),
+                'X-RateLimit-Retry-After': str(int(time()) + 1)
+            }
+            if self._tokens < 1.0:
+                headers['X-RateLimit-Remaining'] = '0'
+                headers['Retry-After'] = f'{(1.0 - self._tokens) / self.rate_limit:.3f}'
+                return 429, headers
+            self._tokens -= 1.0
+            headers['X-RateLimit-Remaining'] = str(int(self._tokens))
+            return 200, headers
+
+    def start(self: Self) -> Self:
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _FakeRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    server: FakeServer
+
+    def _handle(self: Self, method: str) -> None:
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length > 0 else b''
+        if self.server.latency > 0:
+            sleep(self.server.latency)
+        status, headers = self.server.admit()
+        if status != 200:
+            self._reply(status, {'result': 'error'}, headers)
+            return
+        account = self.server.account
+        path = parts.path
+        if method == 'POST' and path == '/auth/token':
+            self._reply(200, {'access_token': 'token', 'expires_in': 900, 'token_type': 'Bearer'}, headers)
+        elif method == 'GET' and path == '/mangadex/manga/status':
+            self._reply(200, {'result': 'ok', 'statuses': account.statuses}, headers)
+        elif method == 'GET' and path == '/mangadex/manga':
+            ids = query.get('ids[]', [])
+            data = [account.mangas[manga_id] for manga_id in ids if manga_id in account.mangas]
+            self._reply(200, {'result': 'ok', 'data': data}, headers)
+        elif method == 'GET' and path.startswith('/mangadex/manga/'):
+            manga_id = path.rsplit('/', 1)[1]
+            if manga_id not in account.mangas:
+                self._reply(404, {'result': 'error'}, headers)
+            else:
+                self._reply(200, {'result': 'ok', 'data': account.mangas[manga_id]}, headers)
+        elif method == 'GET' and path == '/mangadex/statistics/manga':
+            statistics = {manga_id: {'rating': {'bayesian': account.ratings[manga_id]}} for manga_id in query.get('manga[]', []) if manga_id in account.ratings}
+            self._reply(200, {'result': 'ok', 'statistics': statistics}, headers)
+        elif method == 'GET' and path == '/mangadex/rating':
+            ratings = {manga_id: {'rating': account.personal_ratings[manga_id]} for manga_id in query.get('manga[]', []) if manga_id in account.personal_ratings}
+            self._reply(200, {'result': 'ok', 'ratings': ratings}, headers)
+        elif method == 'PUT' and path == '/mangaupdates/account/login':
+            self._reply(200, {'status': 'success', 'context': {'session_token': 'token'}}, headers)
+        elif method == 'POST' and path == '/mangaupdates/lists/0/search':
+            request_data = loads(body)
+            size = request_data['perpage']
+            tracked_ids = sorted(account.tracked_ids)
+            page = tracked_ids[(request_data['page'] - 1) * size:request_data['page'] * size]
+            results = [{'record': {'series': {'id': series_id}}} for series_id in page]
+            self._reply(200, {'total_hits': len(tracked_ids), 'results': results}, headers)
+        elif method == 'POST' and path == '/mangaupdates/lists/series':
+            errors = []
+            for item in loads(body):
+                series_id = item['series']['id']
+                if series_id not in account.series_ids:
+                    errors.append({'series_id': series_id, 'error': 'That series does not exist'})
+                elif series_id in account.tracked_ids:
+                    errors.append({'series_id': series_id, 'error': 'That series is already on one of your lists.'})
+                else:
+                    account.tracked_ids.add(series_id)
+            if len(errors) > 0:
+                self._reply(400, {'status': 'exception', 'context': {'errors': errors}}, headers)
+            else:
+                self._reply(200, {'status': 'success'}, headers)
+        else:
+            self._reply(404, {'result': 'error'}, headers)
+
+    def _reply(self: Self, status: int, data: Any, headers: dict[str, str]) -> None:
+        content = dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            content = compress(content)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(content)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self: Self) -> None:
+        self._handle('GET')
+
+    def do_POST(self: Self) -> None:
+        self._handle('POST')
+
+    def do_PUT(self: Self) -> None:
+        self._handle('PUT')
+
+    def log_message(self: Self, format: str, *args: Any) -> None:
+        pass
+
+
+def _main() -> None:
+    parser = ArgumentParser(description='Serves a synthetic MangaDex and MangaUpdates account.')
+    parser.add_argument('--follows', type=int, default=1000, help='number of followed titles')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='requests per second before answering 429, 0 to disable')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--port', type=int, default=8080, help='port to listen on')
+    arguments = parser.parse_args()
+    server = FakeServer(FakeAccount(arguments.follows), arguments.latency, arguments.rate_limit, arguments.error_rate, arguments.port)
+    print(f'Serving {arguments.follows} follows on {server.url}.')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    _main()
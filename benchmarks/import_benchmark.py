@@ -0,0 +1,50 @@
+from argparse import ArgumentParser
+from json import dump
+from os.path import abspath, dirname, join
+from statistics import median
+from subprocess import run
+from sys import executable
+
+_ROOT = dirname(dirname(abspath(__file__)))
+_SOURCE_PATH = join(_ROOT, 'src')
+_MODULES = ('mangadex_follows_exporter', 'mangadex_client', 'csv_exporter', 'excel_exporter', 'parquet_exporter', 'mangaupdates_exporter')
+
+
+def _measure(module: str) -> tuple[float, list[tuple[float, str]]]:
+    process = run([executable, '-X', 'importtime', '-c', f'import {module}'], cwd=_SOURCE_PATH, capture_output=True, text=True, check=True)
+    imports: list[tuple[float, str]] = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative) / 1000, name.rstrip()))
+    total = next(duration for duration, name in imports if name.strip() == module)
+    return total, imports
+
+
+def _main() -> None:
+    parser = ArgumentParser(description='Times the import of the application modules with "python -X importtime".')
+    parser.add_argument('--repeat', type=int, default=5, help='number of measurements per module')
+    parser.add_argument('--top', type=int, default=10, help='number of slowest imports to show for the entry point')
+    parser.add_argument('--output', default='', help='JSON file to write the results to')
+    arguments = parser.parse_args()
+    results = {}
+    for module in _MODULES:
+        try:
+            durations = [_measure(module)[0] for _ in range(arguments.repeat)]
+        except Exception:
+            print(f'[{module}] Could not be imported.')
+            continue
+        results[module] = median(durations)
+        print(f'[{module}] {results[module]:.1f} ms.')
+    _, imports = _measure(_MODULES[0])
+    print(f'Slowest imports of {_MODULES[0]}:')
+    for duration, name in sorted(((duration, name) for duration, name in imports if name.strip() != _MODULES[0]), reverse=True)[:arguments.top]:
+        print(f'[{name.strip()}] {duration:.1f} ms.')
+    if arguments.output != '':
+        with open(arguments.output, 'wt', encoding='utf-8') as file:
+            dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    _main()
@@ -0,0 +1,39 @@
+from argparse import ArgumentParser
+from os.path import abspath, dirname, join
+from sys import path
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from fake_server import FakeAccount
+
+path.insert(0, join(dirname(dirname(abspath(__file__))), 'src'))
+
+from common import Entry, Status  # noqa: E402
+from csv_exporter import CsvFileExporter  # noqa: E402
+from mangadex_client import MangaDexClient  # noqa: E402
+
+
+def _main() -> None:
+    parser = ArgumentParser(description='Measures the memory used per entry and the speed of the file exporters row generation.')
+    parser.add_argument('--entries', type=int, default=50000, help='number of entries to build')
+    parser.add_argument('--rounds', type=int, default=3, help='how many times every row is generated')
+    arguments = parser.parse_args()
+    account = FakeAccount(arguments.entries)
+    start()
+    memory_before = get_traced_memory()[0]
+    entries = [Entry(MangaDexClient._get_manga(account.mangas[manga_id], Status(manga_id, status)), account.ratings[manga_id], account.personal_ratings.get(manga_id), status) for manga_id, status in account.statuses.items()]
+    memory_after = get_traced_memory()[0]
+    stop()
+    print(f'Built {len(entries)} entries using {(memory_after - memory_before) / len(entries):.0f} bytes per entry.')
+    exporter = CsvFileExporter()
+    time_before = perf_counter()
+    for _ in range(arguments.rounds):
+        for entry in entries:
+            for _ in exporter._get_fields(entry):
+                pass
+    duration = perf_counter() - time_before
+    print(f'Generated {arguments.rounds * len(entries) / duration:.0f} rows per second.')
+
+
+if __name__ == '__main__':
+    _main()
@@ -1,4 +1,6 @@
 CALL ".venv\Scripts\activate.bat"
+python src\build_mangaupdates_index.py
 pyinstaller -F src\mangadex_follows_exporter.py
 COPY configuration.ini dist
-COPY mangaupdates.json dist
\ No newline at end of file
+COPY mangaupdates.json dist
+COPY mangaupdates.idx dist
\ No newline at end of file
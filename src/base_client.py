@@ -1,8 +1,54 @@
-from requests import Response
+from configparser import ConfigParser
+from random import uniform
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Any, Self
+
+from requests import Response, Session
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError
+
+from console import log
+from metrics import Metrics
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
 
 class BaseClient:
 
+    _RETRY_BASE_DELAY = 1.0
+    _RETRY_MAX_ATTEMPTS = 5
+    _RETRY_MAX_DELAY = 60.0
+    _RETRY_STATUSES = frozenset((429, 502, 503, 504))
+    _RETRY_UNPROCESSED_STATUSES = frozenset((429,))
+
+    _http2: bool
+    _pool_size: int
+    _retries_left: int
+    _retries_lock: Lock
+
+    def __init__(self: Self, config: ConfigParser) -> None:
+        self._http2 = config.getboolean('network', 'http2', fallback=False)
+        self._pool_size = config.getint('network', 'pool_size', fallback=0)
+        self._retries_left = config.getint('network', 'retry_budget', fallback=50)
+        self._retries_lock = Lock()
+
+    def _create_session(self: Self, workers: int) -> Session:
+        pool_size = self._pool_size if self._pool_size > 0 else max(workers, 1)
+        adapter: BaseAdapter
+        if self._http2:
+            from http2_adapter import Http2Adapter
+            adapter = Http2Adapter(pool_size)
+        else:
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+        session = Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     @staticmethod
     def _get_error(response: Response) -> RuntimeError:
         error = RuntimeError('Request failed.')
@@ -11,3 +57,65 @@ class BaseClient:
         error.add_note(f'Request: {response.request.body}')
         error.add_note(f'Response: {response.content}')
         return error
+
+    @staticmethod
+    def _get_json(response: Response) -> Any:
+        return loads(response.content)
+
+    def _get_retry_delay(self: Self, attempt: int, response: Response | None) -> float:
+        if response is not None and 'Retry-After' in response.headers:
+            try:
+                return min(float(response.headers['Retry-After']), self._RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+        delay = min(self._RETRY_BASE_DELAY * 2 ** attempt, self._RETRY_MAX_DELAY)
+        return uniform(delay / 2, delay)
+
+    @staticmethod
+    def _get_wire_size(response: Response) -> int:
+        raw_size = response.raw.tell() if hasattr(response.raw, 'tell') else 0
+        if raw_size > 0:
+            return raw_size
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isascii() and content_length.isdecimal():
+            return int(content_length)
+        return len(response.content)
+
+    def _request(self: Self, method: str, url: str, is_idempotent: bool | None = None, **kwargs: Any) -> Response:
+        if is_idempotent is None:
+            is_idempotent = method != 'POST'
+        retry_statuses = self._RETRY_STATUSES if is_idempotent else self._RETRY_UNPROCESSED_STATUSES
+        attempt = 0
+        while True:
+            start = perf_counter()
+            try:
+                response = self._send(method, url, **kwargs)
+            except ConnectionError as error:
+                Metrics.record_request(method, url, perf_counter() - start, 0, 0, True)
+                if not is_idempotent or not self._use_retry(attempt):
+                    raise
+                response = None
+                reason = type(error).__name__
+            else:
+                request_body = response.request.body if response.request is not None else None
+                Metrics.record_request(method, url, response.elapsed.total_seconds(), len(request_body or b''), self._get_wire_size(response), response.status_code >= 400)
+                if response.status_code not in retry_statuses or not self._use_retry(attempt):
+                    return response
+                reason = f'status {response.status_code}'
+            Metrics.record_retry(method, url)
+            delay = self._get_retry_delay(attempt, response)
+            log(f'Request to {url} failed ({reason}), retrying in {delay:.1f} seconds.')
+            sleep(delay)
+            attempt += 1
+
+    def _send(self: Self, method: str, url: str, **kwargs: Any) -> Response:
+        raise NotImplementedError('This method has not been implemented.')
+
+    def _use_retry(self: Self, attempt: int) -> bool:
+        if attempt + 1 >= self._RETRY_MAX_ATTEMPTS:
+            return False
+        with self._retries_lock:
+            if self._retries_left <= 0:
+                return False
+            self._retries_left -= 1
+            return True
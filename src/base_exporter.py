@@ -1,28 +1,50 @@
 from abc import ABC, abstractmethod
 from configparser import ConfigParser
+from os import getcwd, makedirs
+from os.path import join
 from typing import Self
 
-from common import Entry, Manga
+from common import Entry
 
 
 class BaseExporter(ABC):
 
-    is_enabled: bool
+    is_incremental: bool
     name: str
 
-    def __init__(self: Self, name: str) -> None:
-        self.is_enabled = False
+    def __init__(self: Self, name: str, is_incremental: bool = False) -> None:
+        self.is_incremental = is_incremental
         self.name = name
 
     @staticmethod
-    def _get_alternative_title(manga: Manga, language: str) -> str:
-        for entry in manga.alternative_titles:
-            if entry.language == language:
-                return entry.title
-        return ''
+    def _get_output_path(config: ConfigParser, file_name: str) -> str:
+        directory = join(getcwd(), config.get('output', 'path', fallback=''))
+        makedirs(directory, exist_ok=True)
+        return join(directory, file_name)
+
+    def abort(self: Self) -> None:
+        self.close()
+
+    @abstractmethod
+    def close(self: Self) -> None:
+        raise NotImplementedError('This method has not been implemented.')
+
+    def export(self: Self, config: ConfigParser, timestamp: str, entries: list[Entry]) -> None:
+        self.open(config, timestamp, len(entries))
+        try:
+            for entry in entries:
+                self.write(entry)
+        except BaseException:
+            self.abort()
+            raise
+        self.close()
+
+    @abstractmethod
+    def open(self: Self, config: ConfigParser, timestamp: str, total: int) -> None:
+        raise NotImplementedError('This method has not been implemented.')
 
     @staticmethod
-    def _query_activation(name: str) -> bool:
+    def query_activation(name: str) -> bool:
         while True:
             value = input(f'Do you want to export to {name}? [y/n] ').strip().lower()
             if value == 'y':
@@ -32,8 +54,5 @@ class BaseExporter(ABC):
             print('Invalid input.')
 
     @abstractmethod
-    def export(self: Self, config: ConfigParser, timestamp: str, entries: list[Entry]) -> None:
+    def write(self: Self, entry: Entry) -> None:
         raise NotImplementedError('This method has not been implemented.')
-
-    def query_activation(self: Self) -> None:
-        self.is_enabled = self._query_activation(self.name)
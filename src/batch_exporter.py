@@ -0,0 +1,113 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from configparser import ConfigParser
+from contextlib import redirect_stdout
+from json import dump
+from multiprocessing.managers import SyncManager
+from os import chdir, getcwd, makedirs
+from os.path import exists, join
+from time import perf_counter, strftime
+from traceback import format_exc
+from typing import Any
+
+from mangadex_follows_exporter import export, load_configuration
+from mangaupdates_index import MangaUpdatesIndex
+from metrics import Metrics
+from public_data_store import PublicDataStore
+from rate_limiter import RateLimiter
+
+
+class _BatchManager(SyncManager):
+    pass
+
+
+_BatchManager.register('PublicDataStore', PublicDataStore, exposed=('claim', 'put', 'release', 'wait'))
+
+
+def export_batch(resume: bool) -> None:
+    print('Starting batch process.')
+    start = perf_counter()
+    cwd = getcwd()
+    config = load_configuration()
+    accounts = _get_list(config.get('batch', 'accounts', fallback=''))
+    if len(accounts) == 0:
+        raise ValueError('No accounts are listed in the batch section.')
+    output_path = join(cwd, config.get('batch', 'output_path', fallback='accounts'))
+    workers = min(config.getint('batch', 'workers', fallback=2), len(accounts))
+    json_path = join(cwd, 'mangaupdates.json')
+    if exists(json_path):
+        with MangaUpdatesIndex(json_path, join(cwd, 'mangaupdates.idx')):
+            pass
+    results: dict[str, dict[str, Any]] = {}
+    with _BatchManager() as manager:
+        stores = {kind: manager.PublicDataStore(capacity, ttl) for kind, (capacity, ttl) in PublicDataStore.get_settings(config).items()}
+        initargs = (manager.Lock(), manager.dict(), stores)
+        with ProcessPoolExecutor(workers, initializer=_initialize_worker, initargs=initargs) as executor:
+            futures = {}
+            for account in accounts:
+                sections = _get_account_sections(config, account, cwd)
+                futures[executor.submit(_export_account, account, sections, join(output_path, account), resume)] = account
+            print(f'Exporting {len(accounts)} accounts with {workers} workers.')
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['account']] = result
+                print(f'[{result["account"]}] {result["status"].capitalize()} in {result["duration"]:.1f} s.')
+    summary = {
+        'timestamp': strftime('%Y-%m-%d_%H-%M-%S'),
+        'duration': perf_counter() - start,
+        'accounts': [results[account] for account in accounts]
+    }
+    summary_path = join(cwd, config.get('batch', 'summary_path', fallback='batch-summary.json'))
+    print(f'Writing the batch summary to {summary_path}.')
+    with open(summary_path, 'wt', encoding='utf-8') as file:
+        dump(summary, file, indent=2)
+    failed = [result['account'] for result in summary['accounts'] if result['status'] == 'failed']
+    print(f'Batch process completed, {len(accounts) - len(failed)} of {len(accounts)} accounts exported.')
+    if len(failed) > 0:
+        raise RuntimeError(f'The export of {", ".join(failed)} failed, see their export.log files.')
+
+
+def _export_account(account: str, sections: dict[str, dict[str, str]], output_path: str, resume: bool) -> dict[str, Any]:
+    start = perf_counter()
+    Metrics.reset()
+    config = ConfigParser(interpolation=None)
+    config.read_dict(sections)
+    exporter_names = _get_list(config.get('batch', 'exporters', fallback='CSV'))
+    makedirs(output_path, exist_ok=True)
+    chdir(output_path)
+    result: dict[str, Any] = {'account': account, 'output_path': output_path}
+    with open('export.log', 'at', encoding='utf-8') as log, redirect_stdout(log):
+        try:
+            export(resume, exporter_names, config)
+            result['status'] = 'completed'
+        except Exception:
+            details = format_exc()
+            print('An error occurred executing the export.')
+            print(details)
+            result['status'] = 'failed'
+            result['error'] = details.strip().splitlines()[-1]
+    result['duration'] = perf_counter() - start
+    result['metrics'] = Metrics.get_report()
+    return result
+
+
+def _initialize_worker(lock: Any, slots: Any, stores: dict[str, Any]) -> None:
+    RateLimiter.share(lock, slots)
+    PublicDataStore.share(stores)
+
+
+def _get_account_sections(config: ConfigParser, account: str, cwd: str) -> dict[str, dict[str, str]]:
+    sections = {section: dict(config.items(section, raw=True)) for section in config.sections() if ':' not in section}
+    prefix = f'{account}:'
+    for section in config.sections():
+        if section.startswith(prefix):
+            sections.setdefault(section[len(prefix):], {}).update(config.items(section, raw=True))
+    cache = sections.setdefault('cache', {})
+    cache['path'] = join(cwd, cache.get('path', '') or 'cache.sqlite')
+    mangaupdates = sections.setdefault('mangaupdates', {})
+    if mangaupdates.get('data_path', '') == '':
+        mangaupdates['data_path'] = cwd
+    return sections
+
+
+def _get_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(',') if item.strip() != '']
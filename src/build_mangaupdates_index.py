@@ -0,0 +1,17 @@
+from os import getcwd
+from os.path import join
+
+from mangaupdates_index import MangaUpdatesIndex
+
+
+def _main() -> None:
+    cwd = getcwd()
+    json_path = join(cwd, 'mangaupdates.json')
+    index_path = join(cwd, 'mangaupdates.idx')
+    print(f'Building "{index_path}" from "{json_path}".')
+    MangaUpdatesIndex.build(json_path, index_path)
+    print('Index built.')
+
+
+if __name__ == '__main__':
+    _main()
@@ -1,4 +1,4 @@
-from typing import NamedTuple
+from typing import Any, NamedTuple, Self
 
 
 class Status(NamedTuple):
@@ -6,29 +6,44 @@ class Status(NamedTuple):
     status: str
 
 
-class AlternativeTitle(NamedTuple):
-    language: str
-    title: str
-
-
-class ExternalLink(NamedTuple):
-    key: str
-    value: str
-
-
 class Manga(NamedTuple):
     id: str
     type: str
     title_language: str
     title: str
     status: str
-    alternative_titles: list[AlternativeTitle]
-    external_links: list[ExternalLink]
+    alternative_titles: dict[str, tuple[str, ...]]
+    external_links: dict[str, str]
     url: str
 
+    @classmethod
+    def from_data(cls: type[Self], data: Any) -> Self:
+        entry_id, entry_type, title_language, title, status, alternative_titles, external_links, url = data
+        return cls(entry_id, entry_type, title_language, title, status, cls.get_alternative_titles(alternative_titles), dict(external_links), url)
+
+    @staticmethod
+    def get_alternative_titles(data: Any) -> dict[str, tuple[str, ...]]:
+        if isinstance(data, dict):
+            return {language: tuple(titles) for language, titles in data.items()}
+        titles: dict[str, list[str]] = {}
+        for language, title in data:
+            titles.setdefault(language, []).append(title)
+        return {language: tuple(values) for language, values in titles.items()}
+
+    def get_alternative_title(self: Self, language: str) -> str:
+        titles = self.alternative_titles.get(language)
+        if titles is None:
+            return ''
+        return titles[0]
+
 
 class Entry(NamedTuple):
     manga: Manga
     rating: float
     personal_rating: float | None
     status: str
+
+    @classmethod
+    def from_data(cls: type[Self], data: Any) -> Self:
+        manga, rating, personal_rating, status = data
+        return cls(Manga.from_data(manga), rating, personal_rating, status)
@@ -0,0 +1,38 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from configparser import ConfigParser
+from threading import Lock
+from types import TracebackType
+from typing import Self, TypeVar
+
+from mangadex_client import MangaDexClient
+
+_Input = TypeVar('_Input')
+_Output = TypeVar('_Output')
+
+
+class ConcurrentMangaDexClient(MangaDexClient):
+
+    _authorization_lock: Lock
+    _executor: ThreadPoolExecutor | None
+
+    def __enter__(self: Self) -> Self:
+        super().__enter__()
+        self._executor = ThreadPoolExecutor(self._workers)
+        return self
+
+    def __exit__(self: Self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> bool | None:
+        self._executor.shutdown(cancel_futures=True)
+        return super().__exit__(exc_type, exc_val, exc_tb)
+
+    def __init__(self: Self, config: ConfigParser) -> None:
+        super().__init__(config)
+        self._authorization_lock = Lock()
+        self._executor = None
+
+    def _authorize(self: Self) -> None:
+        with self._authorization_lock:
+            super()._authorize()
+
+    def _map(self: Self, function: Callable[[_Input], _Output], inputs: Iterable[_Input]) -> Iterator[_Output]:
+        return self._executor.map(function, inputs)
@@ -0,0 +1,8 @@
+from threading import Lock
+
+_lock = Lock()
+
+
+def log(message: str) -> None:
+    with _lock:
+        print(message, flush=True)
@@ -1,24 +1,34 @@
 from configparser import ConfigParser
+from contextlib import ExitStack
 from csv import writer
-from os import getcwd
-from os.path import join
-from typing import Self
+from typing import Any, Self, TextIO
 
 from common import Entry
+from console import log
 from file_exporter import FileExporter
 
 
 class CsvFileExporter(FileExporter):
 
+    _file: TextIO | None
+    _writer: Any
+
     def __init__(self: Self) -> None:
         super().__init__('CSV')
+        self._file = None
+        self._writer = None
+
+    def close(self: Self) -> None:
+        self._file.close()
+
+    def open(self: Self, config: ConfigParser, timestamp: str, total: int) -> None:
+        output_path = self._get_output_path(config, f'follows_{timestamp}.csv')
+        log(f'Writing to {output_path}.')
+        with ExitStack() as stack:
+            self._file = stack.enter_context(open(output_path, 'wt', encoding='utf-8', newline=''))
+            self._writer = writer(self._file)
+            self._writer.writerow(self._get_headers())
+            stack.pop_all()
 
-    def export(self: Self, config: ConfigParser, timestamp: str, entries: list[Entry]) -> None:
-        cwd = getcwd()
-        output_path = join(cwd, f'follows_{timestamp}.csv')
-        print(f'Writing to {output_path}.')
-        with open(output_path, 'wt', encoding='utf-8', newline='') as output_file:
-            output_writer = writer(output_file)
-            output_writer.writerow(self._get_headers())
-            for entry in entries:
-                output_writer.writerow(self._get_fields(entry))
+    def write(self: Self, entry: Entry) -> None:
+        self._writer.writerow(self._get_fields(entry))
@@ -1,26 +1,55 @@
 from configparser import ConfigParser
-from os import getcwd
-from os.path import join
-from typing import Self
+from typing import Any, Self
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 
 from common import Entry
+from console import log
 from file_exporter import FileExporter
 
 
 class ExcelFileExporter(FileExporter):
 
+    _COLUMN_WIDTHS = (38, 10, 12, 10, 50, 50, 50, 50, 10, 10, 65)
+
+    _hyperlinks: bool
+    _output_path: str
+    _workbook: Workbook | None
+    _worksheet: Any
+
     def __init__(self: Self) -> None:
         super().__init__('Excel')
+        self._hyperlinks = False
+        self._output_path = ''
+        self._workbook = None
+        self._worksheet = None
+
+    def close(self: Self) -> None:
+        try:
+            self._workbook.save(self._output_path)
+        finally:
+            self._workbook.close()
+
+    def open(self: Self, config: ConfigParser, timestamp: str, total: int) -> None:
+        self._output_path = self._get_output_path(config, f'follows_{timestamp}.xlsx')
+        log(f'Writing to {self._output_path}.')
+        self._hyperlinks = config.getboolean('excel', 'hyperlinks', fallback=False)
+        self._workbook = Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet('Follows')
+        if config.getboolean('excel', 'column_widths', fallback=True):
+            for index, width in enumerate(self._COLUMN_WIDTHS, 1):
+                self._worksheet.column_dimensions[get_column_letter(index)].width = width
+        if config.getboolean('excel', 'freeze_header', fallback=True):
+            self._worksheet.freeze_panes = 'A2'
+        self._worksheet.append(list(self._get_headers()))
 
-    def export(self: Self, config: ConfigParser, timestamp: str, entries: list[Entry]) -> None:
-        cwd = getcwd()
-        output_path = join(cwd, f'follows_{timestamp}.xlsx')
-        print(f'Writing to {output_path}.')
-        workbook = Workbook()
-        workbook.active.append(list(self._get_headers()))
-        for entry in entries:
-            workbook.active.append(list(self._get_fields(entry)))
-        workbook.save(output_path)
-        workbook.close()
+    def write(self: Self, entry: Entry) -> None:
+        values = list(self._get_values(entry))
+        if self._hyperlinks:
+            url = WriteOnlyCell(self._worksheet, entry.manga.url)
+            url.hyperlink = entry.manga.url
+            url.style = 'Hyperlink'
+            values[-1] = url
+        self._worksheet.append(values)
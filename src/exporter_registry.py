@@ -0,0 +1,73 @@
+from collections.abc import Callable
+from importlib.util import find_spec
+from typing import NamedTuple, Self
+
+from base_exporter import BaseExporter
+from journal import Journal
+
+
+def _create_csv_exporter(journal: Journal) -> BaseExporter:
+    from csv_exporter import CsvFileExporter
+    return CsvFileExporter()
+
+
+def _create_excel_exporter(journal: Journal) -> BaseExporter:
+    from excel_exporter import ExcelFileExporter
+    return ExcelFileExporter()
+
+
+def _create_mangaupdates_exporter(journal: Journal) -> BaseExporter:
+    from mangaupdates_exporter import MangaUpdatesExporter
+    return MangaUpdatesExporter(journal)
+
+
+def _create_parquet_exporter(journal: Journal) -> BaseExporter:
+    from parquet_exporter import ParquetFileExporter
+    return ParquetFileExporter()
+
+
+class ExporterRegistration(NamedTuple):
+    name: str
+    factory: Callable[[Journal], BaseExporter]
+    requirement: str | None
+
+
+class ExporterRegistry:
+
+    _REGISTRATIONS = (
+        ExporterRegistration('CSV', _create_csv_exporter, None),
+        ExporterRegistration('Excel', _create_excel_exporter, 'openpyxl'),
+        ExporterRegistration('Parquet', _create_parquet_exporter, 'pyarrow'),
+        ExporterRegistration('MangaUpdates', _create_mangaupdates_exporter, None)
+    )
+
+    @classmethod
+    def _get_registration(cls: type[Self], name: str) -> ExporterRegistration:
+        for registration in cls._REGISTRATIONS:
+            if registration.name.lower() == name.strip().lower():
+                return registration
+        raise ValueError(f'Unknown exporter "{name}", expected one of: {", ".join(cls.get_names())}.')
+
+    @classmethod
+    def create(cls: type[Self], name: str, journal: Journal) -> BaseExporter:
+        registration = cls._get_registration(name)
+        if not cls.is_available(registration.name):
+            raise RuntimeError(f'The {registration.name} exporter requires the {registration.requirement} package.')
+        return registration.factory(journal)
+
+    @classmethod
+    def get_available_names(cls: type[Self]) -> list[str]:
+        return [registration.name for registration in cls._REGISTRATIONS if cls.is_available(registration.name)]
+
+    @classmethod
+    def get_name(cls: type[Self], name: str) -> str:
+        return cls._get_registration(name).name
+
+    @classmethod
+    def get_names(cls: type[Self]) -> list[str]:
+        return [registration.name for registration in cls._REGISTRATIONS]
+
+    @classmethod
+    def is_available(cls: type[Self], name: str) -> bool:
+        requirement = cls._get_registration(name).requirement
+        return requirement is None or find_spec(requirement) is not None
@@ -0,0 +1,83 @@
+from configparser import ConfigParser
+from queue import Queue
+from threading import Thread
+from typing import Self
+
+from base_exporter import BaseExporter
+from common import Entry
+from console import log
+from metrics import Metrics
+
+_CLOSE = object()
+
+
+class ExporterScheduler:
+
+    _QUEUE_SIZE = 1000
+
+    _errors: dict[str, BaseException]
+    _exporters: list[BaseExporter]
+    _queues: list[Queue[object]]
+    _threads: list[Thread]
+
+    def __init__(self: Self, exporters: list[BaseExporter]) -> None:
+        self._errors = {}
+        self._exporters = exporters
+        self._queues = []
+        self._threads = []
+
+    @staticmethod
+    def _drain(queue: Queue[object]) -> None:
+        while queue.get() is not _CLOSE:
+            pass
+
+    def _run(self: Self, exporter: BaseExporter, queue: Queue[object], config: ConfigParser, timestamp: str, total: int) -> None:
+        name = f'Exporter {exporter.name}'
+        is_open = False
+        is_closing = False
+        try:
+            with Metrics.measure(name):
+                exporter.open(config, timestamp, total)
+            is_open = True
+            while (entry := queue.get()) is not _CLOSE:
+                with Metrics.measure(name):
+                    exporter.write(entry)
+            is_closing = True
+            is_open = False
+            with Metrics.measure(name):
+                exporter.close()
+        except Exception as error:
+            self._errors[exporter.name] = error
+            log(f'[{exporter.name}] The export failed: {error}')
+            if is_open:
+                try:
+                    exporter.abort()
+                except Exception:
+                    pass
+            if not is_closing:
+                self._drain(queue)
+
+    def close(self: Self) -> None:
+        for queue in self._queues:
+            queue.put(_CLOSE)
+        for thread in self._threads:
+            thread.join()
+        self._queues.clear()
+        self._threads.clear()
+
+    def get_errors(self: Self) -> dict[str, BaseException]:
+        return dict(self._errors)
+
+    def open(self: Self, config: ConfigParser, timestamp: str, total: int, incremental_total: int) -> None:
+        for exporter in self._exporters:
+            log(f'Exporting to {exporter.name}.')
+            queue: Queue[object] = Queue(self._QUEUE_SIZE)
+            thread = Thread(target=self._run, args=(exporter, queue, config, timestamp, incremental_total if exporter.is_incremental else total), name=exporter.name, daemon=True)
+            thread.start()
+            self._queues.append(queue)
+            self._threads.append(thread)
+
+    def write(self: Self, entry: Entry, is_changed: bool) -> None:
+        for exporter, queue in zip(self._exporters, self._queues):
+            if is_changed or not exporter.is_incremental:
+                queue.put(entry)
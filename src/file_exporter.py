@@ -9,17 +9,8 @@ from common import Entry
 class FileExporter(BaseExporter, ABC):
 
     def _get_fields(self: Self, entry: Entry) -> Generator[str]:
-        yield entry.manga.id
-        yield entry.manga.type
-        yield entry.manga.status
-        yield entry.manga.title_language
-        yield entry.manga.title
-        yield self._get_alternative_title(entry.manga, 'en')
-        yield self._get_alternative_title(entry.manga, 'ja')
-        yield self._get_alternative_title(entry.manga, 'ja-RO')
-        yield str(entry.rating)
-        yield str(entry.personal_rating)
-        yield entry.manga.url
+        for value in self._get_values(entry):
+            yield str(value)
 
     @staticmethod
     def _get_headers() -> Generator[str]:
@@ -34,3 +25,16 @@ class FileExporter(BaseExporter, ABC):
         yield 'Rating'
         yield 'Personal Rating'
         yield 'URL'
+
+    def _get_values(self: Self, entry: Entry) -> Generator[str | float | None]:
+        yield entry.manga.id
+        yield entry.manga.type
+        yield entry.manga.status
+        yield entry.manga.title_language
+        yield entry.manga.title
+        yield entry.manga.get_alternative_title('en')
+        yield entry.manga.get_alternative_title('ja')
+        yield entry.manga.get_alternative_title('ja-RO')
+        yield entry.rating
+        yield entry.personal_rating
+        yield entry.manga.url
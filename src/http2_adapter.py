@@ -0,0 +1,53 @@
+from importlib import import_module
+from typing import Any, Self
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class Http2Adapter(BaseAdapter):
+
+    _HOP_BY_HOP_HEADERS = frozenset(('connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'))
+
+    _client: Any
+    _httpx: Any
+
+    def __init__(self: Self, pool_size: int) -> None:
+        super().__init__()
+        try:
+            self._httpx = import_module('httpx')
+            import_module('h2')
+        except ImportError as error:
+            raise RuntimeError('The HTTP/2 transport requires the httpx and h2 packages.') from error
+        limits = self._httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._client = self._httpx.Client(http2=True, limits=limits)
+
+    def _get_timeout(self: Self, timeout: Any) -> Any:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def close(self: Self) -> None:
+        self._client.close()
+
+    def send(self: Self, request: PreparedRequest, stream: bool = False, timeout: Any = None, verify: bool | str = True, cert: Any = None, proxies: Any = None) -> Response:
+        headers = {key: value for key, value in request.headers.items() if key.lower() not in self._HOP_BY_HOP_HEADERS}
+        try:
+            httpx_response = self._client.request(request.method, request.url, headers=headers, content=request.body, timeout=self._get_timeout(timeout))
+        except self._httpx.TransportError as error:
+            raise ConnectionError(error, request=request) from error
+        response = Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict(httpx_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = httpx_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = httpx_response.elapsed
+        response._content = httpx_response.content
+        return response
@@ -0,0 +1,67 @@
+from contextlib import AbstractContextManager
+from json import dumps, loads
+from os import getcwd, remove
+from os.path import exists, join
+from threading import Lock
+from types import TracebackType
+from typing import Any, Self, TextIO
+
+from common import Entry
+
+
+class Journal(AbstractContextManager):
+
+    timestamp: str
+    _file: TextIO | None
+    _lock: Lock
+    _path: str
+    _records: list[Any]
+    _resume: bool
+
+    def __enter__(self: Self) -> Self:
+        if self._resume and exists(self._path):
+            with open(self._path, 'rt', encoding='utf-8') as file:
+                self._records = [loads(line) for line in file if line.endswith('\n')]
+        if len(self._records) > 0 and self._records[0]['kind'] == 'start':
+            self.timestamp = self._records[0]['timestamp']
+            self._file = open(self._path, 'at', encoding='utf-8')
+        else:
+            self._records = []
+            self._file = open(self._path, 'wt', encoding='utf-8')
+            self._write({'kind': 'start', 'timestamp': self.timestamp})
+        return self
+
+    def __exit__(self: Self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> bool | None:
+        self._file.close()
+        if exc_type is None:
+            remove(self._path)
+
+    def __init__(self: Self, resume: bool, timestamp: str) -> None:
+        self.timestamp = timestamp
+        self._file = None
+        self._lock = Lock()
+        self._path = join(getcwd(), 'journal.jsonl')
+        self._records = []
+        self._resume = resume
+
+    def _write(self: Self, record: Any) -> None:
+        line = dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def get_entries(self: Self) -> dict[str, Entry]:
+        entries = (Entry.from_data(record['data']) for record in self._records if record['kind'] == 'entry')
+        return {entry.manga.id: entry for entry in entries}
+
+    def get_processed(self: Self, name: str) -> set[str]:
+        return {record['id'] for record in self._records if record['kind'] == 'processed' and record['name'] == name}
+
+    def is_resumed(self: Self) -> bool:
+        return len(self._records) > 0
+
+    def write_entry(self: Self, entry: Entry) -> None:
+        self._write({'kind': 'entry', 'data': entry})
+
+    def write_processed(self: Self, name: str, entry_id: str) -> None:
+        self._write({'kind': 'processed', 'name': name, 'id': entry_id})
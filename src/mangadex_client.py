@@ -1,42 +1,71 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable, Iterator
 from configparser import ConfigParser
 from contextlib import AbstractContextManager
+from datetime import UTC, datetime
+from functools import partial
+from sys import intern
 from time import time
 from types import TracebackType
-from typing import Any, Self
+from typing import Any, Self, TypeVar
+from urllib.parse import urlsplit
 
-from requests import Session
+from requests import Response, Session
 
 from base_client import BaseClient
-from common import AlternativeTitle, ExternalLink, Manga, Status
-from throttler import Throttler
+from common import Manga, Status
+from metadata_cache import MetadataCache
+from metrics import Metrics
+from public_data_store import PublicDataStore
+from rate_limiter import RateLimiter
+
+_Input = TypeVar('_Input')
+_Output = TypeVar('_Output')
 
 
 class MangaDexClient(BaseClient, AbstractContextManager):
 
-    _THROTTLE_THRESHOLD = 0.2
+    _PAGE_SIZE = 100
+    _QUERY_MAX_LENGTH = 4096
+    _RATE_LIMIT = 5.0
 
+    _api_url: str
     _authentication_expires_at: float
+    _authentication_url: str
+    _cache: MetadataCache | None
     _client_id: str
     _client_secret: str
+    _mangas: PublicDataStore[Manga]
     _password: str
+    _ratings: PublicDataStore[float | None]
     _session: Session | None
     _username: str
+    _workers: int
 
     def __enter__(self: Self) -> Self:
-        self._session = Session()
+        self._session = self._create_session(self._workers)
+        if self._cache is not None:
+            self._cache.__enter__()
         return self
 
     def __exit__(self: Self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> bool | None:
+        if self._cache is not None:
+            self._cache.__exit__(exc_type, exc_val, exc_tb)
         self._session.close()
 
     def __init__(self: Self, config: ConfigParser) -> None:
+        super().__init__(config)
+        self._api_url = config.get('mangadex', 'api_url', fallback='https://api.mangadex.org')
         self._authentication_expires_at = 0
+        self._authentication_url = config.get('mangadex', 'authentication_url', fallback='https://auth.mangadex.org/realms/mangadex/protocol/openid-connect/token')
+        self._cache = MetadataCache(config) if MetadataCache.is_enabled(config) else None
         self._client_id = config.get('mangadex', 'client_id')
         self._client_secret = config.get('mangadex', 'client_secret')
+        self._mangas = PublicDataStore.for_kind('manga', config)
         self._password = config.get('mangadex', 'password')
+        self._ratings = PublicDataStore.for_kind('rating', config)
         self._session = None
         self._username = config.get('mangadex', 'username')
+        self._workers = config.getint('mangadex', 'workers', fallback=1)
 
     def _authorize(self: Self) -> None:
         if self._authentication_expires_at > time():
@@ -48,11 +77,10 @@ class MangaDexClient(BaseClient, AbstractContextManager):
             'client_id': self._client_id,
             'client_secret': self._client_secret
         }
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.post('https://auth.mangadex.org/realms/mangadex/protocol/openid-connect/token', request_data)
+        response = self._request('POST', self._authentication_url, is_idempotent=True, data=request_data)
         if response.status_code != 200:
             raise self._get_error(response)
-        response_data = response.json()
+        response_data = self._get_json(response)
         access_token = response_data['access_token']
         expires_in = response_data['expires_in']
         token_type = response_data['token_type']
@@ -60,70 +88,213 @@ class MangaDexClient(BaseClient, AbstractContextManager):
         self._session.headers['Authorization'] = token_type + ' ' + access_token
 
     @staticmethod
-    def _get_alternative_titles(data: Any) -> Generator[AlternativeTitle]:
-        if 'altTitles' not in data['data']['attributes'] or data['data']['attributes']['altTitles'] is None:
-            return
-        for entry in data['data']['attributes']['altTitles']:
+    def _get_alternative_titles(data: Any) -> dict[str, tuple[str, ...]]:
+        if 'altTitles' not in data['attributes'] or data['attributes']['altTitles'] is None:
+            return {}
+        titles: dict[str, list[str]] = {}
+        for entry in data['attributes']['altTitles']:
             language = next(iter(entry))
-            title = entry[language]
-            yield AlternativeTitle(language, title)
+            titles.setdefault(intern(language), []).append(entry[language])
+        return {language: tuple(values) for language, values in titles.items()}
+
+    @classmethod
+    def _get_chunks(cls: type[Self], ids: list[str]) -> Generator[list[str]]:
+        chunk: list[str] = []
+        length = 0
+        for entry_id in ids:
+            parameter_length = len('manga%5B%5D=&') + len(entry_id)
+            if len(chunk) > 0 and length + parameter_length > cls._QUERY_MAX_LENGTH:
+                yield chunk
+                chunk = []
+                length = 0
+            chunk.append(entry_id)
+            length += parameter_length
+        if len(chunk) > 0:
+            yield chunk
 
     @staticmethod
-    def _get_external_links(data: Any) -> Generator[ExternalLink]:
-        if 'links' not in data['data']['attributes'] or data['data']['attributes']['links'] is None:
-            return
-        for key, value in data['data']['attributes']['links'].items():
-            yield ExternalLink(key, value)
+    def _get_external_links(data: Any) -> dict[str, str]:
+        if 'links' not in data['attributes'] or data['attributes']['links'] is None:
+            return {}
+        return {intern(key): value for key, value in data['attributes']['links'].items()}
 
-    def get_manga(self: Self, status: Status) -> Manga:
+    @classmethod
+    def _get_manga(cls: type[Self], data: Any, status: Status) -> Manga:
+        entry_id = data['id']
+        entry_type = intern(data['type'])
+        title_language = intern(next(iter(data['attributes']['title'])))
+        title = data['attributes']['title'][title_language]
+        alternative_titles = cls._get_alternative_titles(data)
+        external_links = cls._get_external_links(data)
+        url = 'https://mangadex.org/title/' + data['id']
+        return Manga(entry_id, entry_type, title_language, title, intern(status.status), alternative_titles, external_links, url)
+
+    def _fetch_manga(self: Self, status: Status) -> Manga:
+        self._authorize()
+        response = self._request('GET', f'{self._api_url}/manga/{status.id}')
+        if response.status_code != 200:
+            raise self._get_error(response)
+        data = self._get_json(response)
+        if data['result'] != 'ok':
+            raise self._get_error(response)
+        return self._get_manga(data['data'], status)
+
+    def _fetch_mangas(self: Self, statuses: list[Status], updated_since: float | None = None) -> Generator[Manga]:
+        pages = (statuses[offset:offset + self._PAGE_SIZE] for offset in range(0, len(statuses), self._PAGE_SIZE))
+        for mangas in self._map(partial(self._get_mangas_page, updated_since=updated_since), pages):
+            if self._cache is not None:
+                self._cache.put_mangas(mangas)
+            yield from mangas
+
+    def _fetch_ratings(self: Self, kind: str, owner: str, function: Callable[[list[str]], dict[str, float]], ids: list[str]) -> dict[str, float | None]:
+        ratings: dict[str, float | None] = {}
+        if self._cache is not None:
+            ratings.update(self._cache.get_ratings(kind, owner, ids))
+        missing_ids = [entry_id for entry_id in ids if entry_id not in ratings]
+        fetched_ratings: dict[str, float | None] = dict.fromkeys(missing_ids)
+        for chunk_ratings in self._map(function, self._get_chunks(missing_ids)):
+            fetched_ratings.update(chunk_ratings)
+        if self._cache is not None:
+            self._cache.put_ratings(kind, owner, fetched_ratings)
+        ratings.update(fetched_ratings)
+        return ratings
+
+    def _get_mangas_page(self: Self, statuses: list[Status], updated_since: float | None = None) -> list[Manga]:
+        page = {status.id: status for status in statuses}
+        request_data = {
+            'ids[]': list(page),
+            'contentRating[]': ['safe', 'suggestive', 'erotica', 'pornographic'],
+            'limit': self._PAGE_SIZE
+        }
+        if updated_since is not None:
+            request_data['updatedAtSince'] = datetime.fromtimestamp(updated_since, UTC).strftime('%Y-%m-%dT%H:%M:%S')
         self._authorize()
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.get(f'https://api.mangadex.org/manga/{status.id}')
+        response = self._request('GET', f'{self._api_url}/manga', params=request_data)
         if response.status_code != 200:
             raise self._get_error(response)
-        data = response.json()
+        data = self._get_json(response)
         if data['result'] != 'ok':
             raise self._get_error(response)
-        entry_id = data['data']['id']
-        entry_type = data['data']['type']
-        title_language = next(iter(data['data']['attributes']['title']))
-        title = data['data']['attributes']['title'][title_language]
-        alternative_titles = list(self._get_alternative_titles(data))
-        external_links = list(self._get_external_links(data))
-        url = 'https://mangadex.org/title/' + data['data']['id']
-        return Manga(entry_id, entry_type, title_language, title, status.status, alternative_titles, external_links, url)
-
-    def get_personal_rating(self: Self, manga: Manga) -> float | None:
+        mangas = [self._get_manga(entry, page.pop(entry['id'])) for entry in data['data']]
+        if len(page) > 0 and updated_since is None:
+            error = self._get_error(response)
+            error.add_note(f'Missing: {", ".join(page)}')
+            raise error
+        return mangas
+
+    def _get_personal_ratings_chunk(self: Self, ids: list[str]) -> dict[str, float]:
         self._authorize()
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.get(f'https://api.mangadex.org/rating?manga[]={manga.id}')
+        response = self._request('GET', f'{self._api_url}/rating', params={'manga[]': ids})
         if response.status_code != 200:
             raise self._get_error(response)
-        data = response.json()
+        data = self._get_json(response)
         if data['result'] != 'ok':
             raise self._get_error(response)
-        if len(data['ratings']) == 0:
-            return None
-        return data['ratings'][manga.id]['rating']
+        return {key: value['rating'] for key, value in data['ratings'].items()}
 
-    def get_rating(self: Self, manga: Manga) -> float:
+    def _get_ratings_chunk(self: Self, ids: list[str]) -> dict[str, float]:
         self._authorize()
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.get(f'https://api.mangadex.org/statistics/manga?manga[]={manga.id}')
+        response = self._request('GET', f'{self._api_url}/statistics/manga', params={'manga[]': ids})
         if response.status_code != 200:
             raise self._get_error(response)
-        data = response.json()
+        data = self._get_json(response)
         if data['result'] != 'ok':
             raise self._get_error(response)
-        return data['statistics'][manga.id]['rating']['bayesian']
+        return {key: value['rating']['bayesian'] for key, value in data['statistics'].items()}
+
+    def _get_stored_mangas(self: Self, statuses: list[Status]) -> Generator[Manga]:
+        if self._cache is None:
+            yield from self._fetch_mangas(statuses)
+            return
+        cached = self._cache.get_mangas(statuses)
+        stale: dict[str, Manga] = {}
+        stale_since = time()
+        for manga, is_fresh, fetched_at in cached.values():
+            if is_fresh:
+                yield manga
+            else:
+                stale[manga.id] = manga
+                stale_since = min(stale_since, fetched_at)
+        if len(stale) > 0:
+            stale_statuses = [status for status in statuses if status.id in stale]
+            for manga in self._fetch_mangas(stale_statuses, stale_since):
+                del stale[manga.id]
+                yield manga
+            self._cache.touch_mangas(stale)
+            yield from stale.values()
+        yield from self._fetch_mangas([status for status in statuses if status.id not in cached])
+
+    def _map(self: Self, function: Callable[[_Input], _Output], inputs: Iterable[_Input]) -> Iterator[_Output]:
+        return map(function, inputs)
+
+    def _send(self: Self, method: str, url: str, **kwargs: Any) -> Response:
+        rate_limiter = RateLimiter.for_host(urlsplit(url).netloc, self._RATE_LIMIT, self._RATE_LIMIT)
+        rate_limiter.acquire()
+        response = self._session.request(method, url, **kwargs)
+        rate_limiter.update(response)
+        return response
+
+    def get_manga(self: Self, status: Status) -> Manga:
+        mangas, claimed_ids, pending_ids = self._mangas.claim([status.id])
+        Metrics.record_store('manga', len(mangas), len(claimed_ids), len(pending_ids))
+        if len(pending_ids) > 0:
+            mangas = self._mangas.wait(pending_ids)
+        if status.id in mangas:
+            return mangas[status.id]._replace(status=intern(status.status))
+        try:
+            manga = self._fetch_manga(status)
+            self._mangas.put({manga.id: manga})
+            return manga
+        finally:
+            self._mangas.release(claimed_ids)
+
+    def get_mangas(self: Self, statuses: list[Status]) -> Generator[Manga]:
+        page = {status.id: status for status in statuses}
+        mangas, claimed_ids, pending_ids = self._mangas.claim(list(page))
+        Metrics.record_store('manga', len(mangas), len(claimed_ids), len(pending_ids))
+        for entry_id, manga in mangas.items():
+            yield manga._replace(status=intern(page[entry_id].status))
+        fetched_mangas: dict[str, Manga] = {}
+        try:
+            for manga in self._get_stored_mangas([page[entry_id] for entry_id in claimed_ids]):
+                fetched_mangas[manga.id] = manga
+                if len(fetched_mangas) >= self._PAGE_SIZE:
+                    self._mangas.put(fetched_mangas)
+                    fetched_mangas = {}
+                yield manga
+        finally:
+            self._mangas.put(fetched_mangas)
+            self._mangas.release(claimed_ids)
+        if len(pending_ids) > 0:
+            mangas = self._mangas.wait(pending_ids)
+            for entry_id, manga in mangas.items():
+                yield manga._replace(status=intern(page[entry_id].status))
+            yield from self._get_stored_mangas([page[entry_id] for entry_id in pending_ids if entry_id not in mangas])
+
+    def get_personal_ratings(self: Self, ids: list[str]) -> dict[str, float | None]:
+        return self._fetch_ratings('personal_rating', self._username, self._get_personal_ratings_chunk, ids)
+
+    def get_ratings(self: Self, ids: list[str]) -> dict[str, float | None]:
+        ratings, claimed_ids, pending_ids = self._ratings.claim(ids)
+        Metrics.record_store('rating', len(ratings), len(claimed_ids), len(pending_ids))
+        try:
+            fetched_ratings = self._fetch_ratings('rating', '', self._get_ratings_chunk, claimed_ids)
+            self._ratings.put(fetched_ratings)
+        finally:
+            self._ratings.release(claimed_ids)
+        ratings.update(fetched_ratings)
+        if len(pending_ids) > 0:
+            ratings.update(self._ratings.wait(pending_ids))
+            missing_ids = [entry_id for entry_id in pending_ids if entry_id not in ratings]
+            ratings.update(self._fetch_ratings('rating', '', self._get_ratings_chunk, missing_ids))
+        return ratings
 
     def get_statuses(self: Self) -> Generator[Status]:
         self._authorize()
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.get('https://api.mangadex.org/manga/status')
+        response = self._request('GET', f'{self._api_url}/manga/status')
         if response.status_code != 200:
             raise self._get_error(response)
-        data = response.json()
+        data = self._get_json(response)
         if data['result'] != 'ok':
             raise self._get_error(response)
         for key, value in data['statuses'].items():
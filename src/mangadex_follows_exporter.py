@@ -1,66 +1,154 @@
+from argparse import ArgumentParser, ArgumentTypeError
 from configparser import ConfigParser
+from contextlib import ExitStack
 from locale import LC_ALL, setlocale
 from os import getcwd
 from os.path import join
-from time import strftime
+from time import perf_counter, strftime
 from traceback import format_exc
 
 from base_exporter import BaseExporter
 from common import Entry
-from csv_exporter import CsvFileExporter
-from excel_exporter import ExcelFileExporter
-from mangadex_client import MangaDexClient
-from mangaupdates_exporter import MangaUpdatesExporter
+from console import log
+from exporter_registry import ExporterRegistry
+from exporter_scheduler import ExporterScheduler
+from journal import Journal
+from metrics import Metrics
+from snapshot import Snapshot
 
 
-def export() -> None:
-    print('Starting process.')
+def export(resume: bool, exporter_names: list[str] | None = None, config: ConfigParser | None = None) -> None:
+    log('Starting process.')
+    start = perf_counter()
     cwd = getcwd()
-    config_path = join(cwd, 'configuration.ini')
     timestamp = strftime("%Y-%m-%d_%H-%M-%S")
+    if config is None:
+        config = load_configuration()
+    with Journal(resume, timestamp) as journal:
+        if journal.is_resumed():
+            log(f'Resuming the run started at {journal.timestamp}.')
+        if exporter_names is None:
+            exporter_names = [name for name in ExporterRegistry.get_available_names() if BaseExporter.query_activation(name)]
+        enabled_exporters = [ExporterRegistry.create(name, journal) for name in exporter_names]
+        snapshot = Snapshot(config)
+        previous_entries = snapshot.load()
+        journaled_entries = journal.get_entries()
+        log('Fetching data from MangaDex.')
+        workers = config.getint('mangadex', 'workers', fallback=1)
+        if workers > 1:
+            from concurrent_mangadex_client import ConcurrentMangaDexClient
+            client = ConcurrentMangaDexClient(config)
+        else:
+            from mangadex_client import MangaDexClient
+            client = MangaDexClient(config)
+        with client as mangadex, ExitStack() as stack:
+            log('Fetching statuses.')
+            with Metrics.measure('MangaDex statuses'):
+                statuses = list(mangadex.get_statuses())
+            changed_statuses = [status for status in statuses if status.id not in previous_entries or previous_entries[status.id].status != status.status]
+            if snapshot.is_enabled:
+                log(f'{len(changed_statuses)} of {len(statuses)} entries are new or changed since the last run.')
+            resumed_entries = {status.id: journaled_entries[status.id] for status in changed_statuses if status.id in journaled_entries and journaled_entries[status.id].status == status.status}
+            pending_statuses = [status for status in changed_statuses if status.id not in resumed_entries]
+            ids = [status.id for status in pending_statuses]
+            log('Fetching ratings.')
+            with Metrics.measure('MangaDex ratings'):
+                ratings = mangadex.get_ratings(ids)
+            log('Fetching personal ratings.')
+            with Metrics.measure('MangaDex personal ratings'):
+                personal_ratings = mangadex.get_personal_ratings(ids)
+            scheduler = ExporterScheduler(enabled_exporters)
+            scheduler.open(config, journal.timestamp, len(statuses), len(changed_statuses))
+            stack.callback(scheduler.close)
+            entries: list[Entry] | None = [] if snapshot.is_enabled else None
+            changed_ids = {status.id for status in changed_statuses}
+            for status in statuses:
+                if status.id not in changed_ids:
+                    _write_entry(scheduler, entries, previous_entries[status.id], False)
+            for entry in resumed_entries.values():
+                _write_entry(scheduler, entries, entry, True)
+            count = 0
+            total = len(pending_statuses)
+            log('Fetching entries.')
+            for manga in Metrics.measure_iterator('MangaDex entries', mangadex.get_mangas(pending_statuses)):
+                count += 1
+                entry = Entry(manga, ratings[manga.id], personal_ratings[manga.id], manga.status)
+                journal.write_entry(entry)
+                log(f'[MangaDex] Fetched {count} of {total}: {manga.title} ({manga.id})')
+                _write_entry(scheduler, entries, entry, True)
+        errors = scheduler.get_errors()
+        if len(errors) > 0:
+            error = RuntimeError(f'The export to {", ".join(errors)} failed, run again with --resume to retry.')
+            for name, exporter_error in errors.items():
+                error.add_note(f'{name}: {exporter_error!r}')
+            raise error
+        if entries is not None:
+            snapshot.save(entries)
+    Metrics.record_duration('Total', perf_counter() - start)
+    Metrics.print_report()
+    report_path = config.get('metrics', 'report_path', fallback='')
+    if report_path != '':
+        log(f'Writing the performance summary to {report_path}.')
+        Metrics.write_report(join(cwd, report_path))
+    log('Process completed.')
+
+
+def load_configuration() -> ConfigParser:
+    config_path = join(getcwd(), 'configuration.ini')
     print(f'Loading configuration from "{config_path}".')
     config = ConfigParser(interpolation=None)
     config.read(config_path, 'utf-8')
-    exporters: list[BaseExporter] = [CsvFileExporter(), ExcelFileExporter(), MangaUpdatesExporter()]
-    for exporter in exporters:
-        exporter.query_activation()
-    print('Fetching data from MangaDex.')
-    with MangaDexClient(config) as mangadex:
-        print('Fetching statuses.')
-        statuses = list(mangadex.get_statuses())
-        entries: list[Entry] = []
-        count = 0
-        total = len(statuses)
-        print('Fetching entries.')
-        for status in statuses:
-            count += 1
-            manga = mangadex.get_manga(status)
-            rating = mangadex.get_rating(manga)
-            personal_rating = mangadex.get_personal_rating(manga)
-            entry = Entry(manga, rating, personal_rating, status.status)
-            entries.append(entry)
-            print(f'[MangaDex] Fetched {count} of {total}: {manga.title} ({manga.id})')
-    print('Exporting entries.')
-    for exporter in exporters:
-        if not exporter.is_enabled:
-            continue
-        print(f'Exporting to {exporter.name}.')
-        exporter.export(config, timestamp, entries)
-    print('Process completed.')
+    return config
+
+
+def _write_entry(scheduler: ExporterScheduler, entries: list[Entry] | None, entry: Entry, is_changed: bool) -> None:
+    if entries is not None:
+        entries.append(entry)
+    scheduler.write(entry, is_changed)
 
 
 def _main() -> None:
+    parser = ArgumentParser(description='Exports the MangaDex follows.')
+    parser.add_argument('--resume', action='store_true', help='continue the last interrupted run')
+    parser.add_argument('--batch', action='store_true', help='export every account listed in the batch section without asking questions')
+    parser.add_argument('-e', '--exporters', nargs='+', type=_get_exporter_name, metavar='NAME', help=f'export without asking questions to the given formats ({", ".join(ExporterRegistry.get_names())})')
+    parser.add_argument('-o', '--output-path', metavar='PATH', help='write the exported files to the given directory')
+    arguments = parser.parse_args()
+    is_interactive = not arguments.batch and arguments.exporters is None
     setlocale(LC_ALL, '')
     try:
-        export()
+        if arguments.batch:
+            from batch_exporter import export_batch
+            export_batch(arguments.resume)
+        else:
+            config = load_configuration()
+            if arguments.output_path is not None:
+                config.read_dict({'output': {'path': arguments.output_path}})
+            export(arguments.resume, arguments.exporters, config)
     except KeyboardInterrupt:
         print('The script execution has been interrupted.')
+        is_failed = True
     except Exception:
         details = format_exc()
         print('An error occurred executing the script.')
         print(details)
-    input('Press [enter] to exit.')
+        is_failed = True
+    else:
+        is_failed = False
+    if is_interactive:
+        input('Press [enter] to exit.')
+    elif is_failed:
+        raise SystemExit(1)
+
+
+def _get_exporter_name(value: str) -> str:
+    try:
+        return ExporterRegistry.get_name(value)
+    except ValueError as error:
+        raise ArgumentTypeError(str(error)) from error
 
 
 if __name__ == '__main__':
+    from multiprocessing import freeze_support
+    freeze_support()
     _main()
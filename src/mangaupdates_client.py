@@ -1,14 +1,15 @@
-from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 from contextlib import AbstractContextManager
 from enum import Enum
 from types import TracebackType
-from typing import Self
+from typing import Any, Self
+from urllib.parse import urlsplit
 
-from requests import Session
+from requests import Response, Session
 
 from base_client import BaseClient
-from throttler import Throttler
+from rate_limiter import RateLimiter
 
 
 class MangaUpdatesOutcomes(Enum):
@@ -19,25 +20,70 @@ class MangaUpdatesOutcomes(Enum):
 
 class MangaUpdatesClient(BaseClient, AbstractContextManager):
 
-    _THROTTLE_THRESHOLD = 1.0
+    _BATCH_SIZE = 100
+    _ERRORS = {
+        'That series does not exist': MangaUpdatesOutcomes.NOT_FOUND,
+        'That series is already on one of your lists.': MangaUpdatesOutcomes.ALREADY_TRACKED
+    }
+    _PAGE_SIZE = 100
+    _RATE_LIMIT = 1.0
 
+    _api_url: str
     _is_authenticated: bool
     _password: str
     _session: Session | None
     _username: str
+    _workers: int
 
     def __enter__(self: Self) -> Self:
-        self._session = Session()
+        self._session = self._create_session(self._workers)
         return self
 
     def __exit__(self: Self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> bool | None:
         self._session.close()
 
     def __init__(self: Self, config: ConfigParser) -> None:
+        super().__init__(config)
+        self._api_url = config.get('mangaupdates', 'api_url', fallback='https://api.mangaupdates.com/v1')
         self._is_authenticated = False
         self._password = config.get('mangaupdates', 'password')
         self._session = None
         self._username = config.get('mangaupdates', 'username')
+        self._workers = config.getint('mangaupdates', 'workers', fallback=4)
+
+    def _add_entries_chunk(self: Self, entry_ids: list[int]) -> dict[int, MangaUpdatesOutcomes]:
+        self._authenticate()
+        request_data = [
+            {
+                'series': {
+                    'id': entry_id
+                },
+                'list_id': 0
+            }
+            for entry_id in entry_ids
+        ]
+        response = self._request('POST', f'{self._api_url}/lists/series', json=request_data)
+        outcomes = dict.fromkeys(entry_ids, MangaUpdatesOutcomes.SUCCESS)
+        if response.status_code == 200:
+            return outcomes
+        if response.status_code != 400:
+            raise self._get_error(response)
+        response_data = self._get_json(response)
+        errors = response_data.get('context', {}).get('errors', [])
+        is_rejected = len(errors) == 0
+        for error in errors:
+            outcome = self._ERRORS.get(error.get('error'))
+            entry_id = error.get('series_id', entry_ids[0] if len(entry_ids) == 1 else None)
+            if outcome is None or entry_id not in outcomes:
+                is_rejected = True
+                break
+            outcomes[entry_id] = outcome
+        if not is_rejected:
+            return outcomes
+        if len(entry_ids) == 1:
+            raise self._get_error(response)
+        middle = len(entry_ids) // 2
+        return self._add_entries_chunk(entry_ids[:middle]) | self._add_entries_chunk(entry_ids[middle:])
 
     def _authenticate(self: Self) -> None:
         if self._is_authenticated:
@@ -46,56 +92,44 @@ class MangaUpdatesClient(BaseClient, AbstractContextManager):
             'username': self._username,
             'password': self._password
         }
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.put('https://api.mangaupdates.com/v1/account/login', json=request_data)
+        response = self._request('PUT', f'{self._api_url}/account/login', json=request_data)
         if response.status_code != 200:
             raise self._get_error(response)
-        response_data = response.json()
+        response_data = self._get_json(response)
         if response_data['status'] != 'success':
             raise self._get_error(response)
         self._session.headers['Authorization'] = 'Bearer ' + response_data['context']['session_token']
         self._is_authenticated = True
 
-    def add_entry_to_list(self: Self, entry_id: int) -> MangaUpdatesOutcomes:
-        self._authenticate()
-        request_data = [
-            {
-                'series': {
-                    'id': entry_id
-                },
-                'list_id': 0
-            }
-        ]
-        with Throttler(self._THROTTLE_THRESHOLD):
-            response = self._session.post('https://api.mangaupdates.com/v1/lists/series', json=request_data)
-        if response.status_code == 200:
-            return MangaUpdatesOutcomes.SUCCESS
-        if response.status_code == 400:
-            response_data = response.json()
-            error = response_data['context']['errors'][0]['error']
-            if error == 'That series does not exist':
-                return MangaUpdatesOutcomes.NOT_FOUND
-            if error == 'That series is already on one of your lists.':
-                return MangaUpdatesOutcomes.ALREADY_TRACKED
+    def _get_list_page(self: Self, page: int) -> Any:
+        request_data = {
+            'page': page,
+            'perpage': self._PAGE_SIZE
+        }
+        response = self._request('POST', f'{self._api_url}/lists/0/search', is_idempotent=True, json=request_data)
+        if response.status_code != 200:
             raise self._get_error(response)
-        raise self._get_error(response)
+        return self._get_json(response)
 
-    def get_list_entries(self: Self) -> Iterable[int]:
+    def _send(self: Self, method: str, url: str, **kwargs: Any) -> Response:
+        rate_limiter = RateLimiter.for_host(urlsplit(url).netloc, self._RATE_LIMIT, 1.0)
+        rate_limiter.acquire()
+        response = self._session.request(method, url, **kwargs)
+        rate_limiter.update(response)
+        return response
+
+    def add_entries_to_list(self: Self, entry_ids: list[int]) -> dict[int, MangaUpdatesOutcomes]:
+        outcomes: dict[int, MangaUpdatesOutcomes] = {}
+        for offset in range(0, len(entry_ids), self._BATCH_SIZE):
+            outcomes.update(self._add_entries_chunk(entry_ids[offset:offset + self._BATCH_SIZE]))
+        return outcomes
+
+    def get_list_entries(self: Self) -> set[int]:
         self._authenticate()
-        page = 1
-        size = 100
-        while True:
-            request_data = {
-                'page': page,
-                'perpage': size
-            }
-            with Throttler(self._THROTTLE_THRESHOLD):
-                response = self._session.post('https://api.mangaupdates.com/v1/lists/0/search', json=request_data)
-            if response.status_code != 200:
-                raise self._get_error(response)
-            response_data = response.json()
-            if len(response_data['results']) == 0:
-                return
-            for result in response_data['results']:
-                yield result['record']['series']['id']
-            page += 1
+        response_data = self._get_list_page(1)
+        entries = {result['record']['series']['id'] for result in response_data['results']}
+        pages = range(2, -(-response_data['total_hits'] // self._PAGE_SIZE) + 1)
+        with ThreadPoolExecutor(self._workers) as executor:
+            for page_data in executor.map(self._get_list_page, pages):
+                entries.update(result['record']['series']['id'] for result in page_data['results'])
+        return entries
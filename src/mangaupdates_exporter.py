@@ -1,64 +1,120 @@
 from configparser import ConfigParser
-from json import load
+from contextlib import ExitStack
 from os import getcwd
 from os.path import join
-from typing import Self
+from typing import Self, TextIO
 
 from base_exporter import BaseExporter
 from common import Entry, Manga
+from console import log
+from journal import Journal
 from mangaupdates_client import MangaUpdatesClient, MangaUpdatesOutcomes
+from mangaupdates_index import MangaUpdatesIndex
 
 
 class MangaUpdatesExporter(BaseExporter):
 
-    def __init__(self: Self) -> None:
-        super().__init__('MangaUpdates')
+    _BATCH_SIZE = 100
 
-    @staticmethod
-    def _get_entry_id(mappings: dict[str, str], manga: Manga) -> int | None:
-        for external_link in manga.external_links:
-            if external_link.key == 'mu':
-                if external_link.value in mappings:
-                    return int(mappings[external_link.value], 36)
-                return int(external_link.value, 36)
-        return None
+    _client: MangaUpdatesClient | None
+    _count: int
+    _errors: TextIO | None
+    _index: MangaUpdatesIndex | None
+    _journal: Journal
+    _pending: dict[int, tuple[int, Entry]]
+    _processed_entries: set[str]
+    _resources: ExitStack
+    _total: int
+    _tracked_entries: set[int]
+
+    def __init__(self: Self, journal: Journal) -> None:
+        super().__init__('MangaUpdates', True)
+        self._client = None
+        self._count = 0
+        self._errors = None
+        self._index = None
+        self._journal = journal
+        self._pending = {}
+        self._processed_entries = set()
+        self._resources = ExitStack()
+        self._total = 0
+        self._tracked_entries = set()
 
     @staticmethod
-    def _get_old_ids_mappings() -> dict[str, str]:
-        with open('mangaupdates.json', 'rt', encoding='utf-8') as file:
-            return load(file)
+    def _get_entry_id(index: MangaUpdatesIndex, manga: Manga) -> int | None:
+        old_id = manga.external_links.get('mu')
+        if old_id is None:
+            return None
+        entry_id = index.get(old_id)
+        if entry_id is not None:
+            return entry_id
+        return int(old_id, 36)
+
+    def _flush(self: Self) -> None:
+        if len(self._pending) == 0:
+            return
+        outcomes = self._client.add_entries_to_list(list(self._pending))
+        for entry_id, (count, entry) in self._pending.items():
+            self._report(count, entry, entry_id, outcomes[entry_id])
+            self._journal.write_processed(self.name, entry.manga.id)
+        self._pending.clear()
+
+    def _report(self: Self, count: int, entry: Entry, entry_id: int, outcome: MangaUpdatesOutcomes) -> None:
+        total = self._total
+        if outcome == MangaUpdatesOutcomes.SUCCESS:
+            self._tracked_entries.add(entry_id)
+            log(f'[MangaUpdates] Entry {count} of {total} added. "{entry.manga.title}" ({entry.manga.id})')
+        elif outcome == MangaUpdatesOutcomes.NOT_FOUND:
+            log(f'[MangaUpdates] Entry {count} of {total} failed: the entry does not exist in MangaUpdates. "{entry.manga.title}" ({entry.manga.id})')
+            self._errors.write(f'The entry does not exist in MangaUpdates: "{entry.manga.title}" ({entry.manga.id}).')
+        elif outcome == MangaUpdatesOutcomes.ALREADY_TRACKED:
+            log(f'[MangaUpdates] Entry {count} of {total} skipped: the entry is already tracked, could this be a duplicate? "{entry.manga.title}" ({entry.manga.id})')
+            self._errors.write(f'The entry is already tracked, is this an error? "{entry.manga.title}" ({entry.manga.id}).')
+        else:
+            error = RuntimeError('Unexpected outcome.')
+            error.add_note(f'Outcome: {outcome}')
+            raise error
 
-    def export(self: Self, config: ConfigParser, timestamp: str, entries: list[Entry]) -> None:
-        mappings = self._get_old_ids_mappings()
+    def abort(self: Self) -> None:
+        self._pending.clear()
+        self._resources.close()
+
+    def close(self: Self) -> None:
+        with self._resources:
+            self._flush()
+
+    def open(self: Self, config: ConfigParser, timestamp: str, total: int) -> None:
         cwd = getcwd()
-        errors_path = join(cwd, f'mangaupdates-errors_{timestamp}.txt')
-        with open(errors_path, 'wt', encoding='utf-8') as errors:
-            with MangaUpdatesClient(config) as client:
-                count = 0
-                total = len(entries)
-                print('[MangaUpdates] Retrieving already tracked entries.')
-                tracked_entries = set(client.get_list_entries())
-                for entry in entries:
-                    count += 1
-                    entry_id = self._get_entry_id(mappings, entry.manga)
-                    if entry_id is None:
-                        print(f'[MangaUpdates] Entry {count} of {total} failed: the entry does not have a MangaUpdates ID. "{entry.manga.title}" ({entry.manga.id})')
-                        errors.write(f'The entry does not have a MangaUpdates ID: {entry.manga.title} ({entry.manga.id}).')
-                        continue
-                    if entry_id in tracked_entries:
-                        print(f'[MangaUpdates] Entry {count} of {total} skipped: the entry is already tracked. "{entry.manga.title}" ({entry.manga.id})')
-                        continue
-                    outcome = client.add_entry_to_list(entry_id)
-                    if outcome == MangaUpdatesOutcomes.SUCCESS:
-                        tracked_entries.add(entry_id)
-                        print(f'[MangaUpdates] Entry {count} of {total} added. "{entry.manga.title}" ({entry.manga.id})')
-                    elif outcome == MangaUpdatesOutcomes.NOT_FOUND:
-                        print(f'[MangaUpdates] Entry {count} of {total} failed: the entry does not exist in MangaUpdates. "{entry.manga.title}" ({entry.manga.id})')
-                        errors.write(f'The entry does not exist in MangaUpdates: "{entry.manga.title}" ({entry.manga.id}).')
-                    elif outcome == MangaUpdatesOutcomes.ALREADY_TRACKED:
-                        print(f'[MangaUpdates] Entry {count} of {total} skipped: the entry is already tracked, could this be a duplicate? "{entry.manga.title}" ({entry.manga.id})')
-                        errors.write(f'The entry is already tracked, is this an error? "{entry.manga.title}" ({entry.manga.id}).')
-                    else:
-                        error = RuntimeError('Unexpected outcome.')
-                        error.add_note(f'Outcome: {outcome}')
-                        raise error
+        data_path = config.get('mangaupdates', 'data_path', fallback='') or cwd
+        with ExitStack() as stack:
+            self._index = stack.enter_context(MangaUpdatesIndex(join(data_path, 'mangaupdates.json'), join(data_path, 'mangaupdates.idx')))
+            errors_path = self._get_output_path(config, f'mangaupdates-errors_{timestamp}.txt')
+            self._errors = stack.enter_context(open(errors_path, 'at', encoding='utf-8'))
+            self._client = stack.enter_context(MangaUpdatesClient(config))
+            self._count = 0
+            self._pending.clear()
+            self._total = total
+            log('[MangaUpdates] Retrieving already tracked entries.')
+            self._tracked_entries = self._client.get_list_entries()
+            self._processed_entries = self._journal.get_processed(self.name)
+            self._resources = stack.pop_all()
+
+    def write(self: Self, entry: Entry) -> None:
+        self._count += 1
+        count = self._count
+        total = self._total
+        if entry.manga.id in self._processed_entries:
+            return
+        entry_id = self._get_entry_id(self._index, entry.manga)
+        if entry_id is None:
+            log(f'[MangaUpdates] Entry {count} of {total} failed: the entry does not have a MangaUpdates ID. "{entry.manga.title}" ({entry.manga.id})')
+            self._errors.write(f'The entry does not have a MangaUpdates ID: {entry.manga.title} ({entry.manga.id}).')
+            self._journal.write_processed(self.name, entry.manga.id)
+            return
+        if entry_id in self._tracked_entries or entry_id in self._pending:
+            log(f'[MangaUpdates] Entry {count} of {total} skipped: the entry is already tracked. "{entry.manga.title}" ({entry.manga.id})')
+            self._journal.write_processed(self.name, entry.manga.id)
+            return
+        self._pending[entry_id] = (count, entry)
+        if len(self._pending) >= self._BATCH_SIZE:
+            self._flush()
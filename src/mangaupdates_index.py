@@ -0,0 +1,69 @@
+from array import array
+from bisect import bisect_left
+from contextlib import AbstractContextManager
+from json import load
+from mmap import ACCESS_READ, mmap
+from os import replace
+from os.path import exists, getmtime
+from types import TracebackType
+from typing import BinaryIO, Self
+
+
+class MangaUpdatesIndex(AbstractContextManager):
+
+    _KEY_SIZE = 4
+    _VALUE_SIZE = 8
+
+    _file: BinaryIO | None
+    _index_path: str
+    _json_path: str
+    _keys: memoryview | None
+    _map: mmap | None
+    _values: memoryview | None
+
+    def __enter__(self: Self) -> Self:
+        if not exists(self._index_path) or (exists(self._json_path) and getmtime(self._json_path) > getmtime(self._index_path)):
+            self.build(self._json_path, self._index_path)
+        self._file = open(self._index_path, 'rb')
+        self._map = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        count = len(self._map) // (self._KEY_SIZE + self._VALUE_SIZE)
+        view = memoryview(self._map)
+        self._keys = view[:count * self._KEY_SIZE].cast('I')
+        self._values = view[count * self._KEY_SIZE:].cast('Q')
+        return self
+
+    def __exit__(self: Self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> bool | None:
+        self._keys.release()
+        self._values.release()
+        self._map.close()
+        self._file.close()
+
+    def __init__(self: Self, json_path: str, index_path: str) -> None:
+        self._file = None
+        self._index_path = index_path
+        self._json_path = json_path
+        self._keys = None
+        self._map = None
+        self._values = None
+
+    @staticmethod
+    def build(json_path: str, index_path: str) -> None:
+        with open(json_path, 'rt', encoding='utf-8') as file:
+            mappings = load(file)
+        pairs = sorted((int(key), int(value, 36)) for key, value in mappings.items())
+        keys = array('I', (key for key, _ in pairs))
+        values = array('Q', (value for _, value in pairs))
+        temporary_path = f'{index_path}.tmp'
+        with open(temporary_path, 'wb') as file:
+            keys.tofile(file)
+            values.tofile(file)
+        replace(temporary_path, index_path)
+
+    def get(self: Self, old_id: str) -> int | None:
+        if not old_id.isascii() or not old_id.isdecimal():
+            return None
+        key = int(old_id)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._values[position]
+        return None
@@ -0,0 +1,82 @@
+from collections.abc import Iterable
+from configparser import ConfigParser
+from contextlib import AbstractContextManager
+from json import dumps, loads
+from os import getcwd
+from os.path import join
+from sqlite3 import Connection, connect
+from time import time
+from types import TracebackType
+from typing import Self
+
+from common import Manga, Status
+
+
+class MetadataCache(AbstractContextManager):
+
+    _connection: Connection | None
+    _path: str
+    _ttls: dict[str, float]
+
+    def __enter__(self: Self) -> Self:
+        self._connection = connect(self._path, timeout=60)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS mangas (id TEXT PRIMARY KEY, type TEXT, title_language TEXT, title TEXT, alternative_titles TEXT, external_links TEXT, url TEXT, fetched_at REAL)')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS ratings (kind TEXT, id TEXT, rating REAL, fetched_at REAL, PRIMARY KEY (kind, id))')
+        return self
+
+    def __exit__(self: Self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> bool | None:
+        self._connection.commit()
+        self._connection.close()
+
+    def __init__(self: Self, config: ConfigParser) -> None:
+        self._connection = None
+        self._path = join(getcwd(), config.get('cache', 'path', fallback='cache.sqlite'))
+        self._ttls = {
+            'manga': config.getfloat('cache', 'manga_ttl_hours', fallback=168) * 3600,
+            'rating': config.getfloat('cache', 'rating_ttl_hours', fallback=24) * 3600,
+            'personal_rating': config.getfloat('cache', 'personal_rating_ttl_hours', fallback=1) * 3600
+        }
+
+    @staticmethod
+    def is_enabled(config: ConfigParser) -> bool:
+        return config.getboolean('cache', 'enabled', fallback=False)
+
+    def get_mangas(self: Self, statuses: list[Status]) -> dict[str, tuple[Manga, bool, float]]:
+        mangas: dict[str, tuple[Manga, bool, float]] = {}
+        expires_before = time() - self._ttls['manga']
+        for status in statuses:
+            row = self._connection.execute('SELECT id, type, title_language, title, alternative_titles, external_links, url, fetched_at FROM mangas WHERE id = ?', (status.id,)).fetchone()
+            if row is None:
+                continue
+            entry_id, entry_type, title_language, title, alternative_titles, external_links, url, fetched_at = row
+            alternative_titles = Manga.get_alternative_titles(loads(alternative_titles))
+            external_links = dict(loads(external_links))
+            manga = Manga(entry_id, entry_type, title_language, title, status.status, alternative_titles, external_links, url)
+            mangas[status.id] = (manga, fetched_at > expires_before, fetched_at)
+        return mangas
+
+    def get_ratings(self: Self, kind: str, owner: str, ids: list[str]) -> dict[str, float | None]:
+        ratings: dict[str, float | None] = {}
+        expires_before = time() - self._ttls[kind]
+        for entry_id in ids:
+            row = self._connection.execute('SELECT rating FROM ratings WHERE kind = ? AND id = ? AND fetched_at > ?', (f'{kind}:{owner}', entry_id, expires_before)).fetchone()
+            if row is not None:
+                ratings[entry_id] = row[0]
+        return ratings
+
+    def put_mangas(self: Self, mangas: Iterable[Manga]) -> None:
+        fetched_at = time()
+        rows = ((manga.id, manga.type, manga.title_language, manga.title, dumps(manga.alternative_titles), dumps(manga.external_links), manga.url, fetched_at) for manga in mangas)
+        self._connection.executemany('INSERT OR REPLACE INTO mangas VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        self._connection.commit()
+
+    def put_ratings(self: Self, kind: str, owner: str, ratings: dict[str, float | None]) -> None:
+        fetched_at = time()
+        rows = ((f'{kind}:{owner}', key, value, fetched_at) for key, value in ratings.items())
+        self._connection.executemany('INSERT OR REPLACE INTO ratings VALUES (?, ?, ?, ?)', rows)
+        self._connection.commit()
+
+    def touch_mangas(self: Self, ids: Iterable[str]) -> None:
+        fetched_at = time()
+        self._connection.executemany('UPDATE mangas SET fetched_at = ? WHERE id = ?', ((fetched_at, entry_id) for entry_id in ids))
+        self._connection.commit()
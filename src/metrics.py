@@ -0,0 +1,134 @@
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from json import dump
+from re import compile
+from statistics import quantiles
+from threading import Lock
+from time import perf_counter
+from typing import Any, ClassVar, Self, TypeVar
+from urllib.parse import urlsplit
+
+from rate_limiter import RateLimiter
+
+_END = object()
+_Item = TypeVar('_Item')
+
+
+class Metrics:
+
+    _ID_PATTERN = compile(r'/(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)(?=/|$)')
+
+    _durations: ClassVar[dict[str, float]] = {}
+    _lock: ClassVar[Lock] = Lock()
+    _requests: ClassVar[dict[str, dict[str, Any]]] = {}
+    _stores: ClassVar[dict[str, dict[str, int]]] = {}
+
+    @classmethod
+    def _get_endpoint(cls: type[Self], method: str, url: str) -> str:
+        parts = urlsplit(url)
+        path = cls._ID_PATTERN.sub('/{id}', parts.path)
+        return f'{method} {parts.netloc}{path}'
+
+    @classmethod
+    def _get_request_metrics(cls: type[Self], endpoint: str) -> dict[str, Any]:
+        if endpoint not in cls._requests:
+            cls._requests[endpoint] = {'count': 0, 'errors': 0, 'retries': 0, 'bytes_sent': 0, 'wire_bytes_received': 0, 'latencies': []}
+        return cls._requests[endpoint]
+
+    @staticmethod
+    def _get_percentiles(latencies: list[float]) -> dict[str, float]:
+        if len(latencies) == 0:
+            return {}
+        if len(latencies) == 1:
+            return {'p50': latencies[0], 'p95': latencies[0], 'p99': latencies[0], 'max': latencies[0]}
+        cuts = quantiles(latencies, n=100, method='inclusive')
+        return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98], 'max': max(latencies)}
+
+    @classmethod
+    def get_report(cls: type[Self]) -> dict[str, Any]:
+        with cls._lock:
+            requests = {}
+            for endpoint, metrics in sorted(cls._requests.items()):
+                requests[endpoint] = {key: value for key, value in metrics.items() if key != 'latencies'}
+                requests[endpoint]['latency'] = cls._get_percentiles(metrics['latencies'])
+            durations = dict(cls._durations)
+            stores = {kind: dict(metrics) for kind, metrics in sorted(cls._stores.items())}
+        throttling = {host: rate_limiter.blocked_time for host, rate_limiter in RateLimiter.get_instances().items()}
+        return {'durations': durations, 'requests': requests, 'stores': stores, 'throttling': throttling}
+
+    @classmethod
+    @contextmanager
+    def measure(cls: type[Self], name: str) -> Generator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            cls.record_duration(name, perf_counter() - start)
+
+    @classmethod
+    def measure_iterator(cls: type[Self], name: str, iterator: Iterator[_Item]) -> Generator[_Item]:
+        iterator = iter(iterator)
+        while True:
+            with cls.measure(name):
+                item = next(iterator, _END)
+            if item is _END:
+                return
+            yield item
+
+    @classmethod
+    def print_report(cls: type[Self]) -> None:
+        report = cls.get_report()
+        print('Performance summary.')
+        for name, duration in report['durations'].items():
+            print(f'[{name}] {duration:.2f} seconds.')
+        for endpoint, metrics in report['requests'].items():
+            latency = ', '.join(f'{key} {value * 1000:.0f} ms' for key, value in metrics['latency'].items())
+            print(f'[{endpoint}] {metrics["count"]} requests, {metrics["retries"]} retries, {metrics["errors"]} errors, {metrics["bytes_sent"]} bytes sent, {metrics["wire_bytes_received"]} bytes received on the wire, latency {latency}.')
+        for kind, metrics in report['stores'].items():
+            print(f'[Store {kind}] {metrics["hits"]} hits, {metrics["misses"]} misses, {metrics["coalesced"]} coalesced.')
+        for host, blocked_time in report['throttling'].items():
+            print(f'[{host}] Waited {blocked_time:.1f} seconds for the rate limit.')
+
+    @classmethod
+    def record_duration(cls: type[Self], name: str, duration: float) -> None:
+        with cls._lock:
+            cls._durations[name] = cls._durations.get(name, 0.0) + duration
+
+    @classmethod
+    def record_request(cls: type[Self], method: str, url: str, latency: float, bytes_sent: int, wire_bytes_received: int, is_error: bool) -> None:
+        endpoint = cls._get_endpoint(method, url)
+        with cls._lock:
+            metrics = cls._get_request_metrics(endpoint)
+            metrics['count'] += 1
+            metrics['errors'] += int(is_error)
+            metrics['bytes_sent'] += bytes_sent
+            metrics['wire_bytes_received'] += wire_bytes_received
+            metrics['latencies'].append(latency)
+
+    @classmethod
+    def record_retry(cls: type[Self], method: str, url: str) -> None:
+        endpoint = cls._get_endpoint(method, url)
+        with cls._lock:
+            cls._get_request_metrics(endpoint)['retries'] += 1
+
+    @classmethod
+    def record_store(cls: type[Self], kind: str, hits: int, misses: int, coalesced: int) -> None:
+        with cls._lock:
+            metrics = cls._stores.setdefault(kind, {'hits': 0, 'misses': 0, 'coalesced': 0})
+            metrics['hits'] += hits
+            metrics['misses'] += misses
+            metrics['coalesced'] += coalesced
+
+    @classmethod
+    def reset(cls: type[Self]) -> None:
+        with cls._lock:
+            cls._durations.clear()
+            cls._requests.clear()
+            cls._stores.clear()
+        for rate_limiter in RateLimiter.get_instances().values():
+            rate_limiter.blocked_time = 0.0
+
+    @classmethod
+    def write_report(cls: type[Self], path: str) -> None:
+        with open(path, 'wt', encoding='utf-8') as file:
+            dump(cls.get_report(), file, indent=2)
@@ -0,0 +1,88 @@
+from configparser import ConfigParser
+from importlib import import_module
+from typing import Any, Self
+
+from common import Entry
+from console import log
+from file_exporter import FileExporter
+
+
+class ParquetFileExporter(FileExporter):
+
+    _columns: dict[str, list[Any]]
+    _output_path: str
+    _pyarrow: Any
+    _row_group_size: int
+    _schema: Any
+    _writer: Any
+
+    def __init__(self: Self) -> None:
+        super().__init__('Parquet')
+        self._columns = {}
+        self._output_path = ''
+        self._pyarrow = None
+        self._row_group_size = 0
+        self._schema = None
+        self._writer = None
+
+    def _flush(self: Self) -> None:
+        if len(self._columns['id']) == 0:
+            return
+        pa = self._pyarrow
+        arrays = []
+        for field in self._schema:
+            if pa.types.is_dictionary(field.type):
+                array = pa.array(self._columns[field.name], pa.string()).dictionary_encode()
+            else:
+                array = pa.array(self._columns[field.name], field.type)
+            arrays.append(array)
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        for values in self._columns.values():
+            values.clear()
+
+    def _get_schema(self: Self) -> Any:
+        pa = self._pyarrow
+        category = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema([
+            pa.field('id', pa.string(), False),
+            pa.field('type', category, False),
+            pa.field('status', category, False),
+            pa.field('title_language', category, False),
+            pa.field('title', pa.string(), False),
+            pa.field('alternative_titles', pa.list_(pa.struct([pa.field('language', pa.string()), pa.field('title', pa.string())])), False),
+            pa.field('external_links', pa.list_(pa.struct([pa.field('key', pa.string()), pa.field('value', pa.string())])), False),
+            pa.field('rating', pa.float64()),
+            pa.field('personal_rating', pa.float64()),
+            pa.field('url', pa.string(), False)
+        ])
+
+    def close(self: Self) -> None:
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
+
+    def open(self: Self, config: ConfigParser, timestamp: str, total: int) -> None:
+        self._pyarrow = import_module('pyarrow')
+        parquet = import_module('pyarrow.parquet')
+        self._output_path = self._get_output_path(config, f'follows_{timestamp}.parquet')
+        log(f'Writing to {self._output_path}.')
+        self._row_group_size = config.getint('parquet', 'row_group_size', fallback=10000)
+        self._schema = self._get_schema()
+        self._columns = {name: [] for name in self._schema.names}
+        self._writer = parquet.ParquetWriter(self._output_path, self._schema, compression='zstd')
+
+    def write(self: Self, entry: Entry) -> None:
+        manga = entry.manga
+        self._columns['id'].append(manga.id)
+        self._columns['type'].append(manga.type)
+        self._columns['status'].append(manga.status)
+        self._columns['title_language'].append(manga.title_language)
+        self._columns['title'].append(manga.title)
+        self._columns['alternative_titles'].append([{'language': language, 'title': title} for language, titles in manga.alternative_titles.items() for title in titles])
+        self._columns['external_links'].append([{'key': key, 'value': value} for key, value in manga.external_links.items()])
+        self._columns['rating'].append(entry.rating)
+        self._columns['personal_rating'].append(entry.personal_rating)
+        self._columns['url'].append(manga.url)
+        if len(self._columns['id']) >= self._row_group_size:
+            self._flush()
@@ -0,0 +1,122 @@
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from configparser import ConfigParser
+from threading import Condition, Lock
+from time import monotonic
+from typing import Any, ClassVar, Generic, Self, TypeVar
+
+_Value = TypeVar('_Value')
+
+
+class PublicDataStore(Generic[_Value]):
+
+    _WAIT_TIMEOUT = 300.0
+
+    _instances: ClassVar[dict[str, Any]] = {}
+    _instances_lock: ClassVar[Lock] = Lock()
+
+    _capacity: int
+    _condition: Condition
+    _entries: OrderedDict[str, tuple[_Value, float]]
+    _in_flight: set[str]
+    _results: dict[str, _Value]
+    _ttl: float
+    _waiting: Counter[str]
+
+    def __init__(self: Self, capacity: int, ttl: float) -> None:
+        self._capacity = capacity
+        self._condition = Condition()
+        self._entries = OrderedDict()
+        self._in_flight = set()
+        self._results = {}
+        self._ttl = ttl
+        self._waiting = Counter()
+
+    @classmethod
+    def for_kind(cls: type[Self], kind: str, config: ConfigParser) -> Self:
+        with cls._instances_lock:
+            if kind not in cls._instances:
+                capacity, ttl = cls.get_settings(config)[kind]
+                cls._instances[kind] = cls(capacity, ttl)
+            return cls._instances[kind]
+
+    @staticmethod
+    def get_settings(config: ConfigParser) -> dict[str, tuple[int, float]]:
+        capacity = config.getint('cache', 'memory_size', fallback=10000)
+        return {
+            'manga': (capacity, config.getfloat('cache', 'manga_ttl_hours', fallback=168) * 3600),
+            'rating': (capacity, config.getfloat('cache', 'rating_ttl_hours', fallback=24) * 3600)
+        }
+
+    @classmethod
+    def share(cls: type[Self], stores: dict[str, Any]) -> None:
+        with cls._instances_lock:
+            cls._instances.update(stores)
+
+    def claim(self: Self, ids: Iterable[str]) -> tuple[dict[str, _Value], list[str], list[str]]:
+        values: dict[str, _Value] = {}
+        claimed_ids: list[str] = []
+        pending_ids: list[str] = []
+        with self._condition:
+            now = monotonic()
+            for entry_id in dict.fromkeys(ids):
+                entry = self._entries.get(entry_id)
+                if entry is not None:
+                    if entry[1] > now:
+                        self._entries.move_to_end(entry_id)
+                        values[entry_id] = entry[0]
+                        continue
+                    del self._entries[entry_id]
+                if entry_id in self._in_flight:
+                    pending_ids.append(entry_id)
+                    continue
+                self._in_flight.add(entry_id)
+                claimed_ids.append(entry_id)
+        return values, claimed_ids, pending_ids
+
+    def put(self: Self, values: dict[str, _Value]) -> None:
+        with self._condition:
+            expires_at = monotonic() + self._ttl
+            for entry_id, value in values.items():
+                if self._capacity > 0:
+                    self._entries[entry_id] = (value, expires_at)
+                    self._entries.move_to_end(entry_id)
+                if entry_id in self._waiting:
+                    self._results[entry_id] = value
+                self._in_flight.discard(entry_id)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+            self._condition.notify_all()
+
+    def release(self: Self, ids: Iterable[str]) -> None:
+        with self._condition:
+            self._in_flight.difference_update(ids)
+            self._condition.notify_all()
+
+    def wait(self: Self, ids: Iterable[str]) -> dict[str, _Value]:
+        values: dict[str, _Value] = {}
+        waited_ids = list(dict.fromkeys(ids))
+        remaining_ids = waited_ids
+        deadline = monotonic() + self._WAIT_TIMEOUT
+        with self._condition:
+            self._waiting.update(waited_ids)
+            try:
+                while len(remaining_ids) > 0 and monotonic() < deadline:
+                    pending_ids = []
+                    for entry_id in remaining_ids:
+                        if entry_id in self._results:
+                            values[entry_id] = self._results[entry_id]
+                        elif entry_id in self._entries:
+                            values[entry_id] = self._entries[entry_id][0]
+                        elif entry_id in self._in_flight:
+                            pending_ids.append(entry_id)
+                    remaining_ids = pending_ids
+                    if len(remaining_ids) > 0:
+                        self._condition.wait(deadline - monotonic())
+            finally:
+                for entry_id in waited_ids:
+                    self._waiting[entry_id] -= 1
+                    if self._waiting[entry_id] <= 0:
+                        del self._waiting[entry_id]
+                        self._results.pop(entry_id, None)
+        return values
@@ -0,0 +1,147 @@
+from threading import Lock
+from time import monotonic, sleep, time
+from typing import TYPE_CHECKING, Any, ClassVar, Self
+
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class RateLimiter:
+
+    _BACKOFF_BASE_DELAY = 1.0
+    _BACKOFF_MAX_DELAY = 60.0
+    _LOW_BUDGET_RATIO = 0.2
+
+    _instances: ClassVar[dict[str, 'RateLimiter']] = {}
+    _instances_lock: ClassVar[Lock] = Lock()
+    _shared_lock: ClassVar[Any] = None
+    _shared_slots: ClassVar[Any] = None
+
+    blocked_time: float
+    _backoff: float
+    _blocked_until: float
+    _capacity: float
+    _host: str
+    _last_request_at: float
+    _limit: int | None
+    _lock: Lock
+    _rate: float
+    _remaining: int | None
+    _reset_at: float
+    _tokens: float
+    _updated_at: float
+
+    def __init__(self: Self, rate: float, capacity: float, host: str = '') -> None:
+        self.blocked_time = 0.0
+        self._backoff = self._BACKOFF_BASE_DELAY
+        self._blocked_until = 0.0
+        self._capacity = capacity
+        self._host = host
+        self._last_request_at = 0.0
+        self._limit = None
+        self._lock = Lock()
+        self._rate = rate
+        self._remaining = None
+        self._reset_at = 0.0
+        self._tokens = capacity
+        self._updated_at = monotonic()
+
+    @classmethod
+    def for_host(cls: type[Self], host: str, rate: float, capacity: float) -> Self:
+        with cls._instances_lock:
+            if host not in cls._instances:
+                cls._instances[host] = cls(rate, capacity, host)
+            return cls._instances[host]
+
+    @classmethod
+    def get_instances(cls: type[Self]) -> dict[str, Self]:
+        with cls._instances_lock:
+            return dict(cls._instances)
+
+    def _acquire_shared(self: Self) -> None:
+        if self._shared_slots is None:
+            return
+        with self._shared_lock:
+            now = time()
+            reserved_at = max(now, self._shared_slots.get(self._host, 0.0))
+            self._shared_slots[self._host] = reserved_at + 1.0 / self._rate
+        delay = reserved_at - now
+        if delay > 0.0:
+            with self._lock:
+                self.blocked_time += delay
+            sleep(delay)
+
+    def _block_shared(self: Self, delay: float) -> None:
+        if self._shared_slots is None:
+            return
+        with self._shared_lock:
+            self._shared_slots[self._host] = max(self._shared_slots.get(self._host, 0.0), time() + delay)
+
+    def _get_delay(self: Self, now: float) -> float:
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        delay = 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self._rate
+        if self._remaining is not None and self._limit is not None and now < self._reset_at:
+            if self._remaining <= 0:
+                return max(self._reset_at - now, delay)
+            if self._remaining <= self._limit * self._LOW_BUDGET_RATIO:
+                interval = (self._reset_at - now) / self._remaining
+                delay = max(self._last_request_at + interval - now, delay)
+        return delay
+
+    @staticmethod
+    def _get_header(response: 'Response', name: str) -> float | None:
+        value = response.headers.get(name)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    def acquire(self: Self) -> None:
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                delay = self._get_delay(now)
+                if delay <= 0.0:
+                    self._tokens = max(self._tokens - 1.0, 0.0)
+                    self._last_request_at = now
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    break
+                self.blocked_time += delay
+            sleep(delay)
+        self._acquire_shared()
+
+    @classmethod
+    def share(cls: type[Self], lock: Any, slots: Any) -> None:
+        cls._shared_lock = lock
+        cls._shared_slots = slots
+
+    def update(self: Self, response: 'Response') -> None:
+        limit = self._get_header(response, 'X-RateLimit-Limit')
+        remaining = self._get_header(response, 'X-RateLimit-Remaining')
+        retry_at = self._get_header(response, 'X-RateLimit-Retry-After')
+        retry_after = self._get_header(response, 'Retry-After')
+        with self._lock:
+            now = monotonic()
+            if limit is not None and remaining is not None:
+                self._limit = int(limit)
+                self._remaining = int(remaining)
+                self._reset_at = now + max(retry_at - time(), 0.0) if retry_at is not None else now + 1.0
+            if response.status_code != 429:
+                self._backoff = self._BACKOFF_BASE_DELAY
+                return
+            if retry_after is not None:
+                delay = retry_after
+            elif retry_at is not None:
+                delay = max(retry_at - time(), 0.0)
+            else:
+                delay = self._backoff
+                self._backoff = min(self._backoff * 2, self._BACKOFF_MAX_DELAY)
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self._tokens = 0.0
+        self._block_shared(delay)
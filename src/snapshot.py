@@ -0,0 +1,33 @@
+from configparser import ConfigParser
+from json import dump, load
+from os import getcwd, replace
+from os.path import exists, join
+from typing import Self
+
+from common import Entry
+
+
+class Snapshot:
+
+    is_enabled: bool
+    _path: str
+
+    def __init__(self: Self, config: ConfigParser) -> None:
+        self.is_enabled = config.getboolean('incremental', 'enabled', fallback=False)
+        self._path = join(getcwd(), config.get('incremental', 'path', fallback='snapshot.json'))
+
+    def load(self: Self) -> dict[str, Entry]:
+        if not self.is_enabled or not exists(self._path):
+            return {}
+        with open(self._path, 'rt', encoding='utf-8') as file:
+            data = load(file)
+        entries = (Entry.from_data(entry) for entry in data['entries'])
+        return {entry.manga.id: entry for entry in entries}
+
+    def save(self: Self, entries: list[Entry]) -> None:
+        if not self.is_enabled:
+            return
+        temporary_path = self._path + '.tmp'
+        with open(temporary_path, 'wt', encoding='utf-8') as file:
+            dump({'entries': entries}, file, ensure_ascii=False)
+        replace(temporary_path, self._path)